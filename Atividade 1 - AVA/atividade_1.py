@@ -1,99 +1,588 @@
-import random
-from anytree import Node as AnyNode, RenderTree
-from anytree.exporter import DotExporter
-from graphviz import Source
-
-class Node:
-    def __init__(self, value):
-        self.value = value
-        self.left = None
-        self.right = None
-
-class BinaryTree:
-    def __init__(self, root_value):
-        self.root = Node(root_value)
-
-    def to_anytree(self, node=None, parent=None):
-        if node is None:
-            node = self.root
-        any_node = AnyNode(f"{node.value}_{id(node)}", parent=parent, label=node.value)
-        if node.left:
-            self.to_anytree(node.left, any_node)
-        if node.right:
-            self.to_anytree(node.right, any_node)
-        return any_node
-
-def render_tree(anytree_root, filename):
-    dot_data = "\n".join(DotExporter(
-        anytree_root,
-        nodenamefunc=lambda n: n.name,
-        nodeattrfunc=lambda n: f'label="{n.label}"'
-    ))
-    graph = Source(dot_data)
-    graph.render(filename, format="png", cleanup=True)
-
-# --------------------------------------------------------
-# 1) Árvore fixa (expressão definida no enunciado)
-
-tree = BinaryTree("/")
-tree.root.left = Node("*")
-tree.root.right = Node("*")
-
-tree.root.left.left = Node("+")
-tree.root.left.right = Node("-")
-
-tree.root.left.left.left = Node("7")
-tree.root.left.left.right = Node("3")
-tree.root.left.right.left = Node("5")
-tree.root.left.right.right = Node("2")
-
-tree.root.right.left = Node("10")
-tree.root.right.right = Node("20")
-
-anytree_root = tree.to_anytree()
-render_tree(anytree_root, "arvore_fixa")
-
-print("Árvore fixa gerada: arvore_fixa.png")
-
-# --------------------------------------------------------
-# 2) Árvore com valores randômicos
-
-OPERATORS = ["+", "-", "*", "/"]
-
-def generate_random_expression():
-    operands = [str(random.randint(1, 20)) for _ in range(3)]
-
-    operators = [random.choice(OPERATORS) for _ in range(2)]
-
-    expression = f"(({operands[0]} {operators[0]} {operands[1]}) {operators[1]} {operands[2]})"
-    return expression
-
-def build_tree_from_expression(expr):
-    tokens = expr.replace("(", " ( ").replace(")", " ) ").split()
-    
-    def parse(tokens):
-        token = tokens.pop(0)
-        if token == "(":
-            left = parse(tokens)
-            op = tokens.pop(0)
-            right = parse(tokens)
-            tokens.pop(0)
-            node = Node(op)
-            node.left = left
-            node.right = right
-            return node
-        else:
-            return Node(token)
-    
-    return parse(tokens)
-
-random_expr = generate_random_expression()
-print("Expressão aleatória gerada:", random_expr)
-
-random_tree = BinaryTree(None)
-random_tree.root = build_tree_from_expression(random_expr)
-
-anytree_random = random_tree.to_anytree()
-render_tree(anytree_random, "arvore_randomica")
-
-print("Árvore randômica gerada: arvore_randomica.png")
\ No newline at end of file
+import keyword
+import math
+import os
+import random
+import operator
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+class Node:
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
+class BinaryTree:
+    def __init__(self, root_value):
+        self.root = Node(root_value)
+
+    def to_anytree(self, node=None, parent=None):
+        from anytree import Node as AnyNode
+
+        if node is None:
+            node = self.root
+        any_node = AnyNode(f"{node.value}_{id(node)}", parent=parent, label=node.value)
+        if node.left:
+            self.to_anytree(node.left, any_node)
+        if node.right:
+            self.to_anytree(node.right, any_node)
+        return any_node
+
+    def compile(self, vectorized=False):
+        if vectorized:
+            return compile_vectorized(self.root)
+        return compile_tree(self.root)
+
+# --------------------------------------------------------
+# Avaliação compilada das árvores de expressão
+
+BINARY_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+# Mesmos literais que tokenize() reconhece (com o sinal do menos unário)
+_NUMBER_RE = re.compile(r"-?(?:\d+(?:\.\d*)?|\.\d+)")
+
+def _parse_operand(value):
+    """
+    Converte o valor de uma folha em número, ou None se for variável. Folhas
+    int/float passam direto; strings só são números se forem literais como
+    os de tokenize(), então 'inf' e 'nan' são nomes de variáveis.
+    """
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str) and _NUMBER_RE.fullmatch(value):
+        return float(value) if "." in value else int(value)
+    return None
+
+# Instruções do programa pós-fixo
+PUSH_CONST, PUSH_VAR, APPLY = range(3)
+
+class PostfixProgram:
+    """
+    Programa pós-fixo já resolvido: code é a lista de instruções
+    (PUSH_CONST, número), (PUSH_VAR, posição em variables) ou
+    (APPLY, função do operador); variables são os nomes das variáveis.
+    """
+    __slots__ = ("code", "variables")
+
+    def __init__(self, code, variables):
+        self.code = code
+        self.variables = variables
+
+def to_postfix(root):
+    """
+    Lista plana de instruções (notação pós-fixa), sem recursão. Constantes
+    são convertidas e variáveis viram posições uma única vez, aqui.
+    """
+    code = []
+    slots = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node.left is None and node.right is None:
+            number = _parse_operand(node.value)
+            if number is not None:
+                code.append((PUSH_CONST, number))
+            else:
+                code.append((PUSH_VAR, slots.setdefault(node.value, len(slots))))
+        elif expanded:
+            func = BINARY_OPERATORS.get(node.value)
+            if func is None:
+                raise ValueError(f"Operador inválido na árvore: {node.value!r}")
+            code.append((APPLY, func))
+        else:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+    return PostfixProgram(code, list(slots))
+
+def evaluate_postfix(program, variables=None):
+    """Avalia um programa de to_postfix com uma pilha de valores."""
+    variables = variables or {}
+    values = [variables[name] for name in program.variables]
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for op, arg in program.code:
+        if op == PUSH_CONST:
+            push(arg)
+        elif op == PUSH_VAR:
+            push(values[arg])
+        else:
+            right = pop()
+            push(arg(pop(), right))
+    return stack.pop()
+
+# Prefixos reservados do código gerado por compile_tree: temporários (_t0,
+# _t1, ...) e constantes que não têm literal em Python (_c0 = inf, ...)
+TEMP_PREFIX = "_t"
+CONST_PREFIX = "_c"
+_RESERVED_RE = re.compile(rf"(?:{TEMP_PREFIX}|{CONST_PREFIX})\d+")
+
+def _leaf_source(value, variables, constants):
+    number = _parse_operand(value)
+    if number is not None:
+        if math.isfinite(number):
+            return repr(number)
+        # inf/nan viram valores prontos no namespace da função gerada, sem
+        # chamar float(), que uma variável chamada 'float' esconderia
+        name = f"{CONST_PREFIX}{len(constants)}"
+        constants[name] = number
+        return name
+    value = str(value)
+    if not value.isidentifier() or keyword.iskeyword(value):
+        raise ValueError(f"Token inválido na árvore: {value!r}")
+    if _RESERVED_RE.fullmatch(value):
+        raise ValueError(f"Nome reservado para o código gerado: {value!r}")
+    variables.add(value)
+    return value
+
+def compile_tree(root):
+    """
+    Gera código Python para a árvore e devolve uma função reutilizável.
+
+    Cada operador vira uma atribuição a um temporário (_t0, _t1, ...), então o
+    código gerado é linear e não esbarra em limites de aninhamento do parser
+    mesmo para árvores muito profundas. Folhas não numéricas viram parâmetros
+    da função, em ordem alfabética (também aceitos por nome). Nós
+    compartilhados (ver intern_tree) são calculados uma única vez.
+    """
+    lines = []
+    variables = set()
+    constants = {}
+    compiled = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in compiled:
+            continue
+        if node.left is None and node.right is None:
+            compiled[id(node)] = _leaf_source(node.value, variables, constants)
+        elif expanded:
+            if node.value not in BINARY_OPERATORS:
+                raise ValueError(f"Operador inválido na árvore: {node.value!r}")
+            name = f"{TEMP_PREFIX}{len(lines)}"
+            left = compiled[id(node.left)]
+            right = compiled[id(node.right)]
+            lines.append(f"    {name} = {left} {node.value} {right}")
+            compiled[id(node)] = name
+        else:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+
+    params = sorted(variables)
+    source = "\n".join(
+        [f"def _compiled({', '.join(params)}):"] + lines + [f"    return {compiled[id(root)]}"]
+    )
+    namespace = dict(constants)
+    exec(compile(source, "<expression>", "exec"), namespace)
+    func = namespace["_compiled"]
+    func.variables = params
+    func.source = source
+    return func
+
+def compile_vectorized(root):
+    """
+    Como compile_tree, mas avalia sobre arrays NumPy inteiros de uma vez.
+
+    Os argumentos são convertidos com numpy.asarray(dtype=float); as operações
+    geradas (+, -, *, /) já são elemento a elemento nos arrays.
+    """
+    import numpy as np
+
+    func = compile_tree(root)
+
+    def vectorized(*args, **kwargs):
+        args = [np.asarray(a, dtype=float) for a in args]
+        kwargs = {k: np.asarray(v, dtype=float) for k, v in kwargs.items()}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return func(*args, **kwargs)
+
+    vectorized.variables = func.variables
+    vectorized.source = func.source
+    return vectorized
+
+# --------------------------------------------------------
+# Árvores compartilhadas (hash-consing): subárvores iguais viram um só nó
+
+def make_node(value, left=None, right=None, table=None):
+    """
+    Cria um nó ou, se table for um dicionário, devolve o nó já existente com
+    o mesmo valor e os mesmos filhos. Como os filhos também são
+    compartilhados, comparar por identidade basta.
+    """
+    if table is None:
+        node = Node(value)
+        node.left = left
+        node.right = right
+        return node
+    key = (value, id(left), id(right))
+    node = table.get(key)
+    if node is None:
+        node = Node(value)
+        node.left = left
+        node.right = right
+        table[key] = node
+    return node
+
+def intern_tree(root, table=None):
+    """
+    Devolve uma cópia da árvore em que subárvores idênticas são um único nó
+    (o resultado é um DAG). A árvore original não é alterada.
+    """
+    if table is None:
+        table = {}
+    shared = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node is None or id(node) in shared:
+            continue
+        if expanded or (node.left is None and node.right is None):
+            left = shared[id(node.left)] if node.left is not None else None
+            right = shared[id(node.right)] if node.right is not None else None
+            shared[id(node)] = make_node(node.value, left, right, table)
+        else:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+    return shared[id(root)]
+
+def evaluate_shared(root, variables=None):
+    """
+    Avalia a árvore memorizando o resultado de cada nó, de modo que uma
+    subárvore compartilhada é calculada uma só vez por avaliação.
+    """
+    variables = variables or {}
+    results = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in results:
+            continue
+        if node.left is None and node.right is None:
+            number = _parse_operand(node.value)
+            results[id(node)] = variables[node.value] if number is None else number
+        elif expanded:
+            func = BINARY_OPERATORS[node.value]
+            results[id(node)] = func(results[id(node.left)], results[id(node.right)])
+        else:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+    return results[id(root)]
+
+def count_nodes(root):
+    """Número de nós distintos (nós compartilhados contam uma vez)."""
+    seen = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is None or id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.append(node.left)
+        stack.append(node.right)
+    return len(seen)
+
+def render_tree(anytree_root, filename):
+    from anytree.exporter import DotExporter
+    from graphviz import Source
+
+    # Em árvores compartilhadas o mesmo nó aparece em vários ramos do anytree
+    # com o mesmo nome; remover as linhas repetidas gera o DAG no Graphviz.
+    dot_data = "\n".join(dict.fromkeys(DotExporter(
+        anytree_root,
+        nodenamefunc=lambda n: n.name,
+        nodeattrfunc=lambda n: f'label="{n.label}"'
+    )))
+    graph = Source(dot_data)
+    graph.render(filename, format="png", cleanup=True)
+
+# --------------------------------------------------------
+# DOT direto dos nós, sem a cópia em anytree. Nós compartilhados (intern_tree)
+# são escritos uma vez só, então o DAG sai pronto.
+
+def iter_dot_lines(root):
+    yield "digraph tree {"
+    names = {id(root): "n0"}
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        name = names[id(node)]
+        yield f'    {name} [label="{_dot_label(node.value)}"];'
+        for child in (node.left, node.right):
+            if child is None:
+                continue
+            if id(child) not in names:
+                names[id(child)] = f"n{len(names)}"
+                stack.append(child)
+            yield f"    {name} -> {names[id(child)]};"
+    yield "}"
+
+def _dot_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+def write_dot(root, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in iter_dot_lines(root))
+
+def render_many(roots, format="png", cleanup=True):
+    """
+    Gera as imagens de várias árvores com uma única execução do Graphviz.
+    roots: {nome do arquivo sem extensão: nó raiz}.
+    """
+    executable = shutil.which("dot")
+    if executable is None:
+        raise RuntimeError("Executável 'dot' do Graphviz não encontrado no PATH")
+    for filename, root in roots.items():
+        write_dot(root, f"{filename}.dot")
+    # Com -O cada entrada gera '<entrada>.<formato>' (arvore.dot.png)
+    subprocess.run([executable, f"-T{format}", "-O", *(f"{name}.dot" for name in roots)], check=True)
+    for name in roots:
+        os.replace(f"{name}.dot.{format}", f"{name}.{format}")
+        if cleanup:
+            os.remove(f"{name}.dot")
+
+# --------------------------------------------------------
+# Expressões aleatórias: geração, parse e avaliação em lote
+
+OPERATORS = ["+", "-", "*", "/"]
+
+def generate_random_expression():
+    operands = [str(random.randint(1, 20)) for _ in range(3)]
+
+    operators = [random.choice(OPERATORS) for _ in range(2)]
+
+    expression = f"(({operands[0]} {operators[0]} {operands[1]}) {operators[1]} {operands[2]})"
+    return expression
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+(?:\.\d*)?|\.\d+)|([A-Za-z_]\w*)|(\S))")
+
+PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2}
+UNARY_MINUS = "u-"
+
+def tokenize(expr):
+    """
+    Gera os tokens da expressão sob demanda (números, variáveis, operadores e
+    parênteses), em uma única passada linear sobre a string.
+    """
+    for match in _TOKEN_RE.finditer(expr):
+        number, name, symbol = match.groups()
+        if number is not None:
+            yield number
+        elif name is not None:
+            yield name
+        elif symbol in PRECEDENCE or symbol in "()":
+            yield symbol
+        else:
+            raise ValueError(f"Caractere inválido na expressão: {symbol!r}")
+
+def build_tree_from_expression(expr, table=None):
+    """
+    Constrói a árvore da expressão com o algoritmo shunting-yard.
+
+    Usa pilhas explícitas (operadores e nós já montados), então o tempo é
+    linear no número de tokens e a profundidade de parênteses não consome a
+    pilha do Python. Respeita precedência (* e / antes de + e -) mesmo sem
+    parênteses e aceita números negativos e menos unário.
+
+    Se table (um dicionário) for dado, subárvores idênticas são compartilhadas
+    entre si e com outras expressões construídas com a mesma tabela.
+    """
+    operators = []
+    operands = []
+
+    def reduce():
+        op = operators.pop()
+        if op == UNARY_MINUS:
+            operand = operands.pop()
+            if operand.left is None and operand.right is None and _parse_operand(operand.value) is not None:
+                value = operand.value
+                value = value[1:] if value.startswith("-") else "-" + value
+                operands.append(make_node(value, table=table))
+                return
+            node = make_node("-", make_node("0", table=table), operand, table)
+        else:
+            if len(operands) < 2:
+                raise ValueError("Expressão malformada: operando ausente")
+            right = operands.pop()
+            node = make_node(op, operands.pop(), right, table)
+        operands.append(node)
+
+    expect_operand = True
+    for token in tokenize(expr):
+        if token == "(":
+            if not expect_operand:
+                raise ValueError("Expressão malformada: '(' inesperado")
+            operators.append(token)
+        elif token == ")":
+            if expect_operand:
+                raise ValueError("Expressão malformada: ')' inesperado")
+            while operators and operators[-1] != "(":
+                reduce()
+            if not operators:
+                raise ValueError("Parênteses desbalanceados")
+            operators.pop()
+        elif token in PRECEDENCE:
+            if expect_operand:
+                if token != "-":
+                    raise ValueError(f"Expressão malformada: operador {token!r} inesperado")
+                operators.append(UNARY_MINUS)
+                continue
+            prec = PRECEDENCE[token]
+            while operators and operators[-1] != "(" and (
+                operators[-1] == UNARY_MINUS or PRECEDENCE[operators[-1]] >= prec
+            ):
+                reduce()
+            operators.append(token)
+            expect_operand = True
+        else:
+            if not expect_operand:
+                raise ValueError(f"Expressão malformada: operando {token!r} inesperado")
+            operands.append(make_node(token, table=table))
+            expect_operand = False
+
+    if expect_operand:
+        raise ValueError("Expressão malformada: termina sem operando")
+    while operators:
+        if operators[-1] == "(":
+            raise ValueError("Parênteses desbalanceados")
+        reduce()
+    return operands.pop()
+
+def generate_expression(rng=random, max_depth=3, expand_prob=0.7, max_operators=None):
+    """
+    Gera uma expressão totalmente parentizada de forma aleatória, com
+    profundidade até max_depth e no máximo max_operators operadores.
+
+    A geração usa uma pilha explícita, então profundidades grandes não
+    esbarram no limite de recursão.
+    """
+    parts = []
+    operators_left = max_operators if max_operators is not None else float("inf")
+    stack = [max_depth]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        expand = item > 0 and operators_left > 0 and (
+            item == max_depth or rng.random() < expand_prob
+        )
+        if expand:
+            operators_left -= 1
+            parts.append("(")
+            stack.append(")")
+            stack.append(item - 1)
+            stack.append(f" {rng.choice(OPERATORS)} ")
+            stack.append(item - 1)
+        else:
+            parts.append(str(rng.randint(1, 20)))
+    return "".join(parts)
+
+def generate_expressions(count, seed=None, **options):
+    """Gera count expressões aleatórias (reprodutíveis quando seed é dado)."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_expression(rng, **options)
+
+def _process_chunk(args):
+    """Gera, constrói e avalia um lote de expressões (executado no pool)."""
+    seed, index, size, options = args
+    processed = 0
+    division_errors = 0
+    for expr in generate_expressions(size, seed=f"{seed}-{index}", **options):
+        tree = build_tree_from_expression(expr)
+        try:
+            evaluate_postfix(to_postfix(tree))
+        except ZeroDivisionError:
+            division_errors += 1
+        processed += 1
+    return processed, division_errors
+
+def run_pipeline(count, chunk_size=1000, seed=0, workers=None, **options):
+    """
+    Processa count expressões em lotes de chunk_size em um pool de processos
+    (geração → parse → construção da árvore → avaliação).
+
+    Cada lote tem sua própria semente derivada de seed, então o resultado é
+    reprodutível independentemente do número de processos. Devolve um
+    dicionário com os totais e a vazão em expressões por segundo.
+    """
+    chunks = []
+    remaining = count
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunks.append((seed, len(chunks), size, options))
+        remaining -= size
+
+    start = time.perf_counter()
+    processed = 0
+    division_errors = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, errors in pool.map(_process_chunk, chunks):
+            processed += done
+            division_errors += errors
+    elapsed = time.perf_counter() - start
+
+    return {
+        "expressions": processed,
+        "division_errors": division_errors,
+        "seconds": elapsed,
+        "expressions_per_second": processed / elapsed if elapsed else float("inf"),
+    }
+
+if __name__ == "__main__":
+    # 1) Árvore fixa (expressão definida no enunciado)
+
+    tree = BinaryTree("/")
+    tree.root.left = Node("*")
+    tree.root.right = Node("*")
+
+    tree.root.left.left = Node("+")
+    tree.root.left.right = Node("-")
+
+    tree.root.left.left.left = Node("7")
+    tree.root.left.left.right = Node("3")
+    tree.root.left.right.left = Node("5")
+    tree.root.left.right.right = Node("2")
+
+    tree.root.right.left = Node("10")
+    tree.root.right.right = Node("20")
+
+    print("Valor da expressão fixa:", tree.compile()())
+
+    # --------------------------------------------------------
+    # 2) Árvore com valores randômicos
+
+    random_expr = generate_random_expression()
+    print("Expressão aleatória gerada:", random_expr)
+
+    random_tree = BinaryTree(None)
+    random_tree.root = build_tree_from_expression(random_expr)
+
+    print("Valor da expressão aleatória:", random_tree.compile()())
+
+    # As duas imagens saem de uma única execução do Graphviz
+    render_many({"arvore_fixa": tree.root, "arvore_randomica": random_tree.root})
+    print("Árvore fixa gerada: arvore_fixa.png")
+    print("Árvore randômica gerada: arvore_randomica.png")
+
+    # --------------------------------------------------------
+    # 3) Geração e avaliação em lote
+
+    stats = run_pipeline(20000, chunk_size=2000, seed=42, max_depth=6)
+    print(
+        f"\nLote: {stats['expressions']} expressões em {stats['seconds']:.2f}s "
+        f"({stats['expressions_per_second']:.0f} expressões/s, "
+        f"{stats['division_errors']} divisões por zero)"
+    )
@@ -1,7 +1,13 @@
+import mmap
+import os
 import random
-from anytree import Node as AnyNode, RenderTree
-from anytree.exporter import DotExporter
-from graphviz import Source
+import shutil
+import struct
+import subprocess
+import sys
+import time
+from array import array
+from html import escape
 
 class Node:
     def __init__(self, value):
@@ -9,61 +15,158 @@ class Node:
         self.left = None
         self.right = None
 
+class SlotNode:
+    # Mesmo nó, sem __dict__ por instância: bem menos memória por nó.
+    __slots__ = ("value", "left", "right")
+
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
 class BinaryTree:
-    def __init__(self):
+    # Instrumentação desligada por padrão (ver enable_stats)
+    _stats = None
+
+    def __init__(self, node_class=Node):
+        # node_class=SlotNode usa nós com __slots__
         self.root = None
+        self.node_class = node_class
+
+    @classmethod
+    def from_iterable(cls, values, node_class=Node):
+        """
+        Constrói uma árvore balanceada (altura O(log n)) a partir dos valores,
+        em qualquer ordem e com ou sem repetições. Se já vierem ordenados a construção é O(n); caso
+        contrário os valores são ordenados uma única vez.
+        """
+        values = list(values)
+        if any(values[i] > values[i + 1] for i in range(len(values) - 1)):
+            values.sort()
+
+        tree = cls(node_class)
+        # Pilha de intervalos [lo, hi) a montar e onde pendurar o nó criado.
+        stack = [(0, len(values), None, None)]
+        while stack:
+            lo, hi, parent, side = stack.pop()
+            if lo >= hi:
+                continue
+            # Com valores repetidos, iguais podem ficar dos dois lados do nó
+            # (esquerda <= nó <= direita). A busca continua correta, porque
+            # para no primeiro igual, e a altura fica O(log n) mesmo se todos
+            # os valores forem iguais.
+            mid = (lo + hi) // 2
+            node = node_class(values[mid])
+            if parent is None:
+                tree.root = node
+            elif side == "left":
+                parent.left = node
+            else:
+                parent.right = node
+            stack.append((lo, mid, node, "left"))
+            stack.append((mid + 1, hi, node, "right"))
+        return tree
 
     def insert(self, value):
         if self.root is None:
-            self.root = Node(value)
+            self.root = self.node_class(value)
         else:
             self._insert(self.root, value)
 
     def _insert(self, current, value):
-        if value < current.value:
-            if current.left is None:
-                current.left = Node(value)
-            else:
-                self._insert(current.left, value)
-        else:
-            if current.right is None:
-                current.right = Node(value)
+        # Contagem para a instrumentação só com ela ligada (uma comparação por nó)
+        counting = self._stats is not None
+        visited = 0
+        while True:
+            if counting:
+                visited += 1
+            if value < current.value:
+                if current.left is None:
+                    current.left = self.node_class(value)
+                    break
+                current = current.left
             else:
-                self._insert(current.right, value)
+                if current.right is None:
+                    current.right = self.node_class(value)
+                    break
+                current = current.right
+        if counting:
+            self._count_path(visited, visited)
 
     def search(self, value):
         return self._search(self.root, value)
 
     def _search(self, current, value):
-        if current is None or current.value == value:
-            return current
-        if value < current.value:
-            return self._search(current.left, value)
-        else:
-            return self._search(current.right, value)
+        counting = self._stats is not None
+        visited = 0
+        while current is not None and current.value != value:
+            if counting:
+                visited += 1
+            if value < current.value:
+                current = current.left
+            else:
+                current = current.right
+        if counting:
+            # Duas comparações por nó do caminho e uma no nó achado
+            found = current is not None
+            self._count_path(visited + found, 2 * visited + found)
+        return current
         
     def remove(self, value):
         self.root = self._remove(self.root, value)
 
     def _remove(self, current, value):
+        # Devolve a nova raiz da subárvore, como a versão recursiva fazia.
+        subtree_root = current
+        parent = None
+        counting = self._stats is not None
+        visited = 0
+        while current is not None and current.value != value:
+            if counting:
+                visited += 1
+            parent = current
+            if value < current.value:
+                current = current.left
+            else:
+                current = current.right
         if current is None:
-            return None
-        if value < current.value:
-            current.left = self._remove(current.left, value)
-        elif value > current.value:
-            current.right = self._remove(current.right, value)
-        else:
-            if current.left is None and current.right is None:
-                return None
-            elif current.left is None:
-                return current.right
-            elif current.right is None:
-                return current.left
+            if counting:
+                self._count_path(visited, 2 * visited)
+            return subtree_root
+        comparisons = 2 * visited + 1
+        visited += 1
+
+        if current.left is not None and current.right is not None:
+            # Copia o sucessor (mínimo da subárvore direita) e remove o nó dele,
+            # que não tem filho à esquerda.
+            sucessor_pai = current
+            sucessor = current.right
+            if counting:
+                visited += 1
+            while sucessor.left is not None:
+                if counting:
+                    visited += 1
+                sucessor_pai = sucessor
+                sucessor = sucessor.left
+            if counting:
+                self._count_path(visited, comparisons)
+            current.value = sucessor.value
+            if sucessor_pai is current:
+                sucessor_pai.right = sucessor.right
             else:
-                sucessor = self._min_value_node(current.right)
-                current.value = sucessor.value
-                current.right = self._remove(current.right, sucessor.value)
-        return current
+                sucessor_pai.left = sucessor.right
+            return subtree_root
+
+        if counting:
+            self._count_path(visited, comparisons)
+        child = current.left if current.left is not None else current.right
+        if parent is None:
+            return child
+        if parent.left is current:
+            parent.left = child
+        else:
+            parent.right = child
+        return subtree_root
 
     def _min_value_node(self, node):
         current = node
@@ -75,24 +178,158 @@ class BinaryTree:
         return self._height(self.root)
 
     def _height(self, node):
+        # Percurso em largura: a altura é o número de níveis menos um.
         if node is None:
             return -1
-        return 1 + max(self._height(node.left), self._height(node.right))
+        height = -1
+        level = [node]
+        while level:
+            height += 1
+            next_level = []
+            for current in level:
+                if current.left is not None:
+                    next_level.append(current.left)
+                if current.right is not None:
+                    next_level.append(current.right)
+            level = next_level
+        return height
 
     def depth(self, value):
         return self._depth(self.root, value, 0)
 
     def _depth(self, current, value, d):
-        if current is None:
-            return -1
-        if current.value == value:
-            return d
-        elif value < current.value:
-            return self._depth(current.left, value, d + 1)
-        else:
-            return self._depth(current.right, value, d + 1)
+        start = d
+        while current is not None:
+            if current.value == value:
+                break
+            elif value < current.value:
+                current = current.left
+            else:
+                current = current.right
+            d += 1
+        if self._stats is not None:
+            # A profundidade já conta os nós do caminho: nada a somar no laço
+            found = current is not None
+            self._count_path(d - start + found, 2 * (d - start) + found)
+        return d if current is not None else -1
         
+    # ------------------------------
+    # Instrumentação opcional. Desligada, as operações rodam sem nenhum
+    # invólucro e as descidas só testam uma variável local para não contar.
+    # Ligada, as operações públicas desta instância passam por um invólucro
+    # que mede o tempo e registra os nós visitados e as comparações contados
+    # na própria descida.
+
+    _INSTRUMENTED = ("insert", "search", "remove", "depth")
+
+    def enable_stats(self, callback=None):
+        """
+        Liga a instrumentação. callback(operação, registro) é chamado após
+        cada operação com tempo (ns), nós visitados e comparações.
+        """
+        self.reset_stats()
+        self._stats_callback = callback
+        for name in self._INSTRUMENTED:
+            setattr(self, name, self._instrument(name, getattr(type(self), name).__get__(self)))
+
+    def disable_stats(self):
+        for name in self._INSTRUMENTED:
+            self.__dict__.pop(name, None)
+        self._stats = None
+        self._stats_callback = None
+
+    def reset_stats(self):
+        self._stats = {
+            "operations": {},
+            "nodes_visited": 0,
+            "comparisons": 0,
+            "max_path_depth": 0,
+        }
+
+    def stats(self):
+        """Cópia dos contadores (None se a instrumentação estiver desligada)."""
+        if self._stats is None:
+            return None
+        result = dict(self._stats)
+        result["operations"] = {
+            name: dict(op, avg_time_ns=op["total_time_ns"] / op["count"])
+            for name, op in self._stats["operations"].items()
+        }
+        return result
+
+    def _count_path(self, visited, comparisons):
+        """Soma o que uma descida contou."""
+        stats = self._stats
+        stats["nodes_visited"] += visited
+        stats["comparisons"] += comparisons
+        if visited > stats["max_path_depth"]:
+            stats["max_path_depth"] = visited
+
+    def _instrument(self, name, method):
+        clock = time.perf_counter_ns
+
+        def wrapper(value):
+            stats = self._stats
+            visited = stats["nodes_visited"]
+            comparisons = stats["comparisons"]
+            start = clock()
+            try:
+                return method(value)
+            finally:
+                elapsed = clock() - start
+                op = stats["operations"].setdefault(name, {"count": 0, "total_time_ns": 0})
+                op["count"] += 1
+                op["total_time_ns"] += elapsed
+                if self._stats_callback is not None:
+                    self._stats_callback(name, {
+                        "time_ns": elapsed,
+                        "nodes_visited": stats["nodes_visited"] - visited,
+                        "comparisons": stats["comparisons"] - comparisons,
+                    })
+        return wrapper
+
+    # ------------------------------
+    # Formato binário: cabeçalho + nós de largura fixa (valor, esquerda,
+    # direita) como inteiros de 64 bits little-endian, em ordem de largura.
+    # Os filhos são índices de nó (-1 = sem filho).
+
+    def save(self, path):
+        nodes = []
+        if self.root is not None:
+            nodes.append(self.root)
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            if node.left is not None:
+                nodes.append(node.left)
+            if node.right is not None:
+                nodes.append(node.right)
+            i += 1
+        index = {id(node): i for i, node in enumerate(nodes)}
+
+        data = array("q")
+        try:
+            for node in nodes:
+                data.append(node.value)
+                data.append(index[id(node.left)] if node.left is not None else NIL)
+                data.append(index[id(node.right)] if node.right is not None else NIL)
+        except (TypeError, OverflowError):
+            raise ValueError("O formato binário aceita apenas valores inteiros de 64 bits")
+        if sys.byteorder == "big":
+            data.byteswap()
+
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(BST_MAGIC, FORMAT_VERSION, len(nodes), 0 if nodes else NIL))
+            data.tofile(f)
+
+    @staticmethod
+    def load(path):
+        """Abre uma árvore salva com save() direto do arquivo (mmap)."""
+        return MappedBinaryTree(path)
+
     def to_anytree(self):
+        from anytree import Node as AnyNode
+
         def build_anytree(node):
             if node is None:
                 return None
@@ -106,13 +343,488 @@ class BinaryTree:
             return any_node
         return build_anytree(self.root)
 
-    def show(self, filename="arvore"):
-        anytree_root = self.to_anytree()
-        for pre, _, node in RenderTree(anytree_root):
-            print("%s%s" % (pre, node.name))
-        DotExporter(anytree_root).to_dotfile(f"{filename}.dot")
-        Source.from_file(f"{filename}.dot").render(filename, format="png", cleanup=True)
-        print(f"Árvore salva em '{filename}.png'.")
+    def iter_text_lines(self):
+        """Linhas do desenho em texto (mesmo formato do RenderTree do anytree)."""
+        if self.root is None:
+            return
+        stack = [(self.root, "", "")]
+        while stack:
+            node, line_prefix, child_prefix = stack.pop()
+            yield f"{line_prefix}{node.value}"
+            if node.right is not None:
+                stack.append((node.right, child_prefix + "└── ", child_prefix + "    "))
+                if node.left is not None:
+                    stack.append((node.left, child_prefix + "├── ", child_prefix + "│   "))
+            elif node.left is not None:
+                stack.append((node.left, child_prefix + "└── ", child_prefix + "    "))
+
+    def iter_dot_lines(self):
+        """Linhas do DOT da árvore; cada nó recebe um nome único (n0, n1, ...)."""
+        yield "digraph tree {"
+        stack = [(self.root, None)] if self.root is not None else []
+        count = 0
+        while stack:
+            node, parent = stack.pop()
+            name = f"n{count}"
+            count += 1
+            yield f'    {name} [label="{_dot_label(node.value)}"];'
+            if parent is not None:
+                yield f"    {parent} -> {name};"
+            if node.right is not None:
+                stack.append((node.right, name))
+            if node.left is not None:
+                stack.append((node.left, name))
+        yield "}"
+
+    def write_dot(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in self.iter_dot_lines())
+
+    def show(self, filename="arvore", render=True, print_tree=True):
+        """
+        Imprime a árvore em texto e gera '<filename>.png'. Com render=False
+        só grava '<filename>.dot', sem chamar o Graphviz; com print_tree=False
+        não imprime o desenho.
+        """
+        if print_tree:
+            sys.stdout.writelines(line + "\n" for line in self.iter_text_lines())
+        if render:
+            render_many({filename: self})
+            print(f"Árvore salva em '{filename}.png'.")
+        else:
+            self.write_dot(f"{filename}.dot")
+            print(f"Árvore salva em '{filename}.dot'.")
+
+    # ------------------------------
+    # Visualização de árvores grandes. Só a parte de cima é desenhada: as
+    # subárvores abaixo de max_depth, ou além de max_nodes nós desenhados,
+    # viram uma caixa com quantidade de nós, menor e maior valor e altura.
+    # Com focus, o caminho até esse valor é sempre desenhado e destacado.
+
+    def _summary(self, node):
+        """(quantidade, menor, maior, altura) da subárvore."""
+        count = 0
+        level = [node]
+        while level:
+            count += len(level)
+            level = [child for current in level for child in (current.left, current.right) if child is not None]
+        low = high = node
+        while low.left is not None:
+            low = low.left
+        while high.right is not None:
+            high = high.right
+        return count, low.value, high.value, self._height(node)
+
+    def _lod_layout(self, max_depth, max_nodes, focus):
+        """
+        Escolhe em largura os itens visíveis (nós e resumos) e devolve uma
+        lista de [nó ou resumo, é_resumo, profundidade, pai, esquerda,
+        direita, x], com x dado pela ordem simétrica.
+        """
+        on_path = set()
+        if focus is not None:
+            current = self.root
+            while current is not None:
+                on_path.add(id(current))
+                if current.value == focus:
+                    break
+                current = current.left if focus < current.value else current.right
+
+        items = []
+        queue = [(self.root, 0, None, False)] if self.root is not None else []
+        head = expanded = 0
+        while head < len(queue):
+            node, depth, parent, is_right = queue[head]
+            head += 1
+            index = len(items)
+            if parent is not None:
+                items[parent][5 if is_right else 4] = index
+            if id(node) in on_path or (depth < max_depth and expanded < max_nodes):
+                expanded += 1
+                items.append([node, False, depth, parent, None, None, 0])
+                if node.left is not None:
+                    queue.append((node.left, depth + 1, index, False))
+                if node.right is not None:
+                    queue.append((node.right, depth + 1, index, True))
+            else:
+                items.append([self._summary(node), True, depth, parent, None, None, 0])
+
+        slot = 0
+        stack = []
+        current = 0 if items else None
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = items[current][4]
+            current = stack.pop()
+            items[current][6] = slot
+            slot += 1
+            current = items[current][5]
+        return items, on_path
+
+    def iter_svg_lines(self, max_depth=8, max_nodes=255, focus=None):
+        """Linhas do SVG resumido (ver write_svg)."""
+        items, on_path = self._lod_layout(max_depth, max_nodes, focus)
+        col, row, margin = 72, 80, 40
+
+        def center(item):
+            return margin + item[6] * col, margin + item[2] * row
+
+        width = 2 * margin + col * max(len(items) - 1, 0)
+        height = 2 * margin + row * max((item[2] for item in items), default=0)
+        yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+               f'font-family="monospace" font-size="11" text-anchor="middle">')
+        for item in items:
+            if item[3] is not None:
+                (x1, y1), (x2, y2) = center(items[item[3]]), center(item)
+                yield f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="#90a4ae"/>'
+        for item in items:
+            x, y = center(item)
+            if item[1]:
+                count, low, high, h = item[0]
+                yield (f'<rect x="{x - 32}" y="{y - 22}" width="64" height="44" rx="4" '
+                       f'fill="#eeeeee" stroke="#757575"/>')
+                for dy, text in ((-9, f"n={count}"), (4, f"{low}..{high}"), (17, f"h={h}")):
+                    yield f'<text x="{x}" y="{y + dy}">{escape(text)}</text>'
+            else:
+                node = item[0]
+                if id(node) not in on_path:
+                    fill = "#e3f2fd"
+                elif node.value == focus:
+                    fill = "#ff8a65"
+                else:
+                    fill = "#ffe082"
+                yield f'<circle cx="{x}" cy="{y}" r="16" fill="{fill}" stroke="#1565c0"/>'
+                yield f'<text x="{x}" y="{y + 4}">{escape(str(node.value))}</text>'
+        yield "</svg>"
+
+    def write_svg(self, path, max_depth=8, max_nodes=255, focus=None):
+        """
+        Grava um SVG da árvore em níveis de detalhe: até max_depth níveis e no
+        máximo max_nodes nós desenhados (mais o caminho até focus); o resto
+        vira caixas de resumo. O arquivo é escrito linha a linha.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in self.iter_svg_lines(max_depth, max_nodes, focus))
+
+
+def _dot_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_many(trees, format="png", cleanup=True):
+    """
+    Gera as imagens de várias árvores com uma única execução do Graphviz.
+    trees: {nome do arquivo sem extensão: BinaryTree}.
+    """
+    for filename, tree in trees.items():
+        tree.write_dot(f"{filename}.dot")
+    _run_dot(list(trees), format, cleanup)
+
+
+def _run_dot(filenames, format="png", cleanup=True):
+    executable = shutil.which("dot")
+    if executable is None:
+        raise RuntimeError("Executável 'dot' do Graphviz não encontrado no PATH")
+    # Com -O cada entrada gera '<entrada>.<formato>' (arvore.dot.png)
+    subprocess.run([executable, f"-T{format}", "-O", *(f"{name}.dot" for name in filenames)], check=True)
+    for name in filenames:
+        os.replace(f"{name}.dot.{format}", f"{name}.{format}")
+        if cleanup:
+            os.remove(f"{name}.dot")
+
+NIL = -1
+
+class ArrayBinaryTree:
+    """
+    Árvore binária de busca com a mesma interface de BinaryTree, mas com os
+    nós guardados em arrays paralelos (valores, filho esquerdo, filho direito)
+    em vez de objetos. Cada nó é um índice; NIL (-1) indica ausência de filho.
+
+    typecode define o tipo dos valores no array ('q' para inteiros de 64 bits,
+    'd' para floats). Posições liberadas por remove entram em uma lista livre
+    (encadeada pelo array da esquerda) e são reaproveitadas por insert.
+    """
+
+    def __init__(self, typecode="q"):
+        self.values = array(typecode)
+        self.left = array("q")
+        self.right = array("q")
+        self.root = NIL
+        self._free = NIL
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, value):
+        return self.search(value)
+
+    def _new_node(self, value):
+        if self._free != NIL:
+            index = self._free
+            # Grava o valor antes de tirar a posição da lista livre: se o array
+            # recusar o valor (TypeError/OverflowError), a lista livre fica intacta.
+            self.values[index] = value
+            self._free = self.left[index]
+            self.left[index] = NIL
+            self.right[index] = NIL
+        else:
+            index = len(self.values)
+            self.values.append(value)
+            self.left.append(NIL)
+            self.right.append(NIL)
+        self._size += 1
+        return index
+
+    def _release(self, index):
+        self.left[index] = self._free
+        self.right[index] = NIL
+        self._free = index
+        self._size -= 1
+
+    def insert(self, value):
+        new = self._new_node(value)
+        if self.root == NIL:
+            self.root = new
+            return
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+        while True:
+            if value < values[current]:
+                if left[current] == NIL:
+                    left[current] = new
+                    return
+                current = left[current]
+            else:
+                if right[current] == NIL:
+                    right[current] = new
+                    return
+                current = right[current]
+
+    def search(self, value):
+        """True se o valor está na árvore (o índice do nó vem de find_index)."""
+        return self.find_index(value) is not None
+
+    def find_index(self, value):
+        """Índice do nó com o valor, ou None (atenção: o índice pode ser 0)."""
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+        while current != NIL and values[current] != value:
+            current = left[current] if value < values[current] else right[current]
+        return None if current == NIL else current
+
+    def remove(self, value):
+        values, left, right = self.values, self.left, self.right
+        parent = NIL
+        current = self.root
+        while current != NIL and values[current] != value:
+            parent = current
+            current = left[current] if value < values[current] else right[current]
+        if current == NIL:
+            return
+
+        if left[current] != NIL and right[current] != NIL:
+            sucessor_pai = current
+            sucessor = right[current]
+            while left[sucessor] != NIL:
+                sucessor_pai = sucessor
+                sucessor = left[sucessor]
+            values[current] = values[sucessor]
+            if sucessor_pai == current:
+                right[sucessor_pai] = right[sucessor]
+            else:
+                left[sucessor_pai] = right[sucessor]
+            self._release(sucessor)
+            return
+
+        child = left[current] if left[current] != NIL else right[current]
+        if parent == NIL:
+            self.root = child
+        elif left[parent] == current:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self._release(current)
+
+    def height(self):
+        if self.root == NIL:
+            return -1
+        left, right = self.left, self.right
+        height = -1
+        level = [self.root]
+        while level:
+            height += 1
+            next_level = []
+            for current in level:
+                if left[current] != NIL:
+                    next_level.append(left[current])
+                if right[current] != NIL:
+                    next_level.append(right[current])
+            level = next_level
+        return height
+
+    def depth(self, value):
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+        d = 0
+        while current != NIL:
+            if values[current] == value:
+                return d
+            current = left[current] if value < values[current] else right[current]
+            d += 1
+        return -1
+
+    def inorder(self):
+        values, left, right = self.values, self.left, self.right
+        result = []
+        stack = []
+        current = self.root
+        while stack or current != NIL:
+            while current != NIL:
+                stack.append(current)
+                current = left[current]
+            current = stack.pop()
+            result.append(values[current])
+            current = right[current]
+        return result
+
+    def preorder(self):
+        values, left, right = self.values, self.left, self.right
+        result = []
+        stack = [self.root] if self.root != NIL else []
+        while stack:
+            current = stack.pop()
+            result.append(values[current])
+            if right[current] != NIL:
+                stack.append(right[current])
+            if left[current] != NIL:
+                stack.append(left[current])
+        return result
+
+    def postorder(self):
+        # Pré-ordem espelhada (raiz, direita, esquerda) invertida.
+        values, left, right = self.values, self.left, self.right
+        result = []
+        stack = [self.root] if self.root != NIL else []
+        while stack:
+            current = stack.pop()
+            result.append(values[current])
+            if left[current] != NIL:
+                stack.append(left[current])
+            if right[current] != NIL:
+                stack.append(right[current])
+        result.reverse()
+        return result
+
+FILE_HEADER = struct.Struct("<4sIqq")  # magic, versão, nº de nós, raiz
+BST_MAGIC = b"BST1"
+FORMAT_VERSION = 1
+
+class MappedBinaryTree:
+    """
+    Árvore salva por BinaryTree.save, somente leitura, lida direto de um
+    arquivo mapeado em memória: abrir não desserializa nada, e cada busca só
+    toca as páginas dos nós do caminho.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder == "big":
+            raise ValueError("Leitura mapeada suportada apenas em máquinas little-endian")
+        with open(path, "rb") as f:
+            # mmap recusa arquivo vazio com mensagem própria; checa o cabeçalho antes
+            if len(f.read(FILE_HEADER.size)) < FILE_HEADER.size:
+                raise ValueError(f"Arquivo '{path}' não é uma árvore binária salva")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, root = FILE_HEADER.unpack_from(self._mmap)
+        if magic != BST_MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Arquivo '{path}' não é uma árvore binária salva")
+        # 3 inteiros de 64 bits por nó; arquivo truncado ou raiz fora dos nós
+        # falhariam só no meio de uma consulta
+        end = FILE_HEADER.size + count * 3 * 8
+        if count < 0 or len(self._mmap) < end or not (root == NIL if count == 0 else 0 <= root < count):
+            self._mmap.close()
+            raise ValueError(f"Arquivo '{path}' está truncado ou corrompido")
+        self._size = count
+        self.root = root
+        self._data = memoryview(self._mmap)[FILE_HEADER.size:end].cast("q")
+
+    def close(self):
+        self._data.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, value):
+        return self.search(value)
+
+    def search(self, value):
+        """True se o valor está na árvore (o índice do nó vem de find_index)."""
+        return self.find_index(value) is not None
+
+    def find_index(self, value):
+        """Índice do nó com o valor, ou None (atenção: o índice pode ser 0)."""
+        data = self._data
+        current = self.root
+        while current != NIL:
+            base = current * 3
+            node_value = data[base]
+            if node_value == value:
+                return current
+            current = data[base + 1] if value < node_value else data[base + 2]
+        return None
+
+    def depth(self, value):
+        data = self._data
+        current = self.root
+        d = 0
+        while current != NIL:
+            base = current * 3
+            if data[base] == value:
+                return d
+            current = data[base + 1] if value < data[base] else data[base + 2]
+            d += 1
+        return -1
+
+    def height(self):
+        if self.root == NIL:
+            return -1
+        data = self._data
+        height = -1
+        level = [self.root]
+        while level:
+            height += 1
+            next_level = []
+            for current in level:
+                left, right = data[current * 3 + 1], data[current * 3 + 2]
+                if left != NIL:
+                    next_level.append(left)
+                if right != NIL:
+                    next_level.append(right)
+            level = next_level
+        return height
+
+    def inorder(self):
+        data = self._data
+        result = []
+        stack = []
+        current = self.root
+        while stack or current != NIL:
+            while current != NIL:
+                stack.append(current)
+                current = data[current * 3 + 1]
+            current = stack.pop()
+            result.append(data[current * 3])
+            current = data[current * 3 + 2]
+        return result
 
 # --------------------------------------------------------
 # 1) Árvore fixa (expressão definida no enunciado)
@@ -159,4 +871,18 @@ if __name__ == "__main__":
     print("\nÁrvore randômica gerada:")
     bt_random.show("arvore_randomica")
 
-    print(f"\nAltura da árvore randômica: {bt_random.height()}")
\ No newline at end of file
+    print(f"\nAltura da árvore randômica: {bt_random.height()}")
+
+    # --------------------------------------------------------
+    # 3) Árvore grande em SVG resumido
+
+    print("\n===== Árvore Grande =====")
+
+    valores_grandes = random.sample(range(1_000_000), 100_000)
+    bt_grande = BinaryTree()
+    for v in valores_grandes:
+        bt_grande.insert(v)
+
+    foco = valores_grandes[0]
+    bt_grande.write_svg("arvore_grande.svg", max_depth=6, focus=foco)
+    print(f"Árvore com {len(valores_grandes)} nós salva em 'arvore_grande.svg' (caminho até {foco} destacado).")
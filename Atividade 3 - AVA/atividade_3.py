@@ -1,7 +1,10 @@
+import os
 import random
-from anytree import Node as AnyNode, RenderTree
-from anytree.exporter import DotExporter
-from graphviz import Source
+import shutil
+import subprocess
+import sys
+from array import array
+from collections import deque
 
 # ------------------------------
 # Nó da árvore
@@ -11,67 +14,188 @@ class Node:
         self.left = None
         self.right = None
 
+class SlotNode:
+    # Mesmo nó, sem __dict__ por instância: bem menos memória por nó.
+    __slots__ = ("value", "left", "right")
+
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
 # ------------------------------
 # Classe da árvore binária
 class BinaryTree:
-    def __init__(self):
+    def __init__(self, node_class=Node):
+        # node_class=SlotNode usa nós com __slots__
         self.root = None
+        self.node_class = node_class
+
+    @classmethod
+    def from_iterable(cls, values, node_class=Node):
+        """
+        Constrói uma árvore balanceada (altura O(log n)) a partir dos valores,
+        em qualquer ordem e com ou sem repetições. Se já vierem ordenados a construção é O(n); caso
+        contrário os valores são ordenados uma única vez.
+        """
+        values = list(values)
+        if any(values[i] > values[i + 1] for i in range(len(values) - 1)):
+            values.sort()
+
+        tree = cls(node_class)
+        # Pilha de intervalos [lo, hi) a montar e onde pendurar o nó criado.
+        stack = [(0, len(values), None, None)]
+        while stack:
+            lo, hi, parent, side = stack.pop()
+            if lo >= hi:
+                continue
+            # Com valores repetidos, iguais podem ficar dos dois lados do nó
+            # (esquerda <= nó <= direita). A busca continua correta, porque
+            # para no primeiro igual, e a altura fica O(log n) mesmo se todos
+            # os valores forem iguais.
+            mid = (lo + hi) // 2
+            node = node_class(values[mid])
+            if parent is None:
+                tree.root = node
+            elif side == "left":
+                parent.left = node
+            else:
+                parent.right = node
+            stack.append((lo, mid, node, "left"))
+            stack.append((mid + 1, hi, node, "right"))
+        return tree
 
     # Inserção
     def insert(self, value):
         if self.root is None:
-            self.root = Node(value)
+            self.root = self.node_class(value)
         else:
             self._insert(self.root, value)
 
     def _insert(self, current, value):
-        if value < current.value:
-            if current.left is None:
-                current.left = Node(value)
-            else:
-                self._insert(current.left, value)
-        else:
-            if current.right is None:
-                current.right = Node(value)
+        while True:
+            if value < current.value:
+                if current.left is None:
+                    current.left = self.node_class(value)
+                    return
+                current = current.left
             else:
-                self._insert(current.right, value)
+                if current.right is None:
+                    current.right = self.node_class(value)
+                    return
+                current = current.right
 
     # ------------------------------
     # Métodos de travessia
 
     def inorder(self):
-        return self._inorder(self.root, [])
-
-    def _inorder(self, node, result):
-        if node:
-            self._inorder(node.left, result)
-            result.append(node.value)
-            self._inorder(node.right, result)
-        return result
+        return list(self.iter_inorder())
 
     def preorder(self):
-        return self._preorder(self.root, [])
-
-    def _preorder(self, node, result):
-        if node:
-            result.append(node.value)
-            self._preorder(node.left, result)
-            self._preorder(node.right, result)
-        return result
+        return list(self.iter_preorder())
 
     def postorder(self):
-        return self._postorder(self.root, [])
+        return list(self.iter_postorder())
+
+    def levelorder(self):
+        return list(self.iter_levelorder())
+
+    # Versões preguiçosas (geradores com pilha explícita): produzem um valor
+    # por vez, podem ser interrompidas a qualquer momento e não dependem do
+    # limite de recursão.
+
+    def iter_inorder(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
 
-    def _postorder(self, node, result):
-        if node:
-            self._postorder(node.left, result)
-            self._postorder(node.right, result)
-            result.append(node.value)
-        return result
+    def iter_preorder(self):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.value
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def iter_postorder(self):
+        stack = []
+        node = self.root
+        last = None
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right and top.right is not last:
+                node = top.right
+            else:
+                stack.pop()
+                last = top
+                yield top.value
+
+    def iter_levelorder(self):
+        queue = deque([self.root] if self.root else [])
+        while queue:
+            node = queue.popleft()
+            yield node.value
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
+
+    def iter_morris_inorder(self):
+        """
+        In-order de Morris: memória extra O(1). Cria ligações temporárias
+        (do predecessor para o nó atual) e as desfaz ao passar por elas, então
+        a árvore não pode ser modificada durante a iteração. Se o gerador for
+        encerrado antes do fim, o percurso é concluído sem produzir valores
+        para remover as ligações restantes.
+        """
+        node = self.root
+        try:
+            while node:
+                if node.left is None:
+                    yield node.value
+                    node = node.right
+                    continue
+                pred = node.left
+                while pred.right and pred.right is not node:
+                    pred = pred.right
+                if pred.right is None:
+                    pred.right = node
+                    node = node.left
+                else:
+                    pred.right = None
+                    yield node.value
+                    node = node.right
+        finally:
+            while node:
+                if node.left is None:
+                    node = node.right
+                    continue
+                pred = node.left
+                while pred.right and pred.right is not node:
+                    pred = pred.right
+                if pred.right is None:
+                    pred.right = node
+                    node = node.left
+                else:
+                    pred.right = None
+                    node = node.right
 
     # ------------------------------
-    # Visualização com anytree + graphviz
+    # Visualização: texto e DOT gerados direto dos nós, sem cópia em anytree
     def to_anytree(self):
+        from anytree import Node as AnyNode
+
         def build_anytree(node):
             if node is None:
                 return None
@@ -85,13 +209,211 @@ class BinaryTree:
             return any_node
         return build_anytree(self.root)
 
-    def show(self, filename="arvore"):
-        anytree_root = self.to_anytree()
-        for pre, _, node in RenderTree(anytree_root):
-            print("%s%s" % (pre, node.name))
-        DotExporter(anytree_root).to_dotfile(f"{filename}.dot")
-        Source.from_file(f"{filename}.dot").render(filename, format="png", cleanup=True)
-        print(f"Árvore salva em '{filename}.png'.\n")
+    def iter_text_lines(self):
+        """Linhas do desenho em texto (mesmo formato do RenderTree do anytree)."""
+        if self.root is None:
+            return
+        stack = [(self.root, "", "")]
+        while stack:
+            node, line_prefix, child_prefix = stack.pop()
+            yield f"{line_prefix}{node.value}"
+            if node.right is not None:
+                stack.append((node.right, child_prefix + "└── ", child_prefix + "    "))
+                if node.left is not None:
+                    stack.append((node.left, child_prefix + "├── ", child_prefix + "│   "))
+            elif node.left is not None:
+                stack.append((node.left, child_prefix + "└── ", child_prefix + "    "))
+
+    def iter_dot_lines(self):
+        """Linhas do DOT da árvore; cada nó recebe um nome único (n0, n1, ...)."""
+        yield "digraph tree {"
+        stack = [(self.root, None)] if self.root is not None else []
+        count = 0
+        while stack:
+            node, parent = stack.pop()
+            name = f"n{count}"
+            count += 1
+            yield f'    {name} [label="{_dot_label(node.value)}"];'
+            if parent is not None:
+                yield f"    {parent} -> {name};"
+            if node.right is not None:
+                stack.append((node.right, name))
+            if node.left is not None:
+                stack.append((node.left, name))
+        yield "}"
+
+    def write_dot(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in self.iter_dot_lines())
+
+    def show(self, filename="arvore", render=True, print_tree=True):
+        """
+        Imprime a árvore em texto e gera '<filename>.png'. Com render=False
+        só grava '<filename>.dot', sem chamar o Graphviz; com print_tree=False
+        não imprime o desenho.
+        """
+        if print_tree:
+            sys.stdout.writelines(line + "\n" for line in self.iter_text_lines())
+        if render:
+            render_many({filename: self})
+            print(f"Árvore salva em '{filename}.png'.\n")
+        else:
+            self.write_dot(f"{filename}.dot")
+            print(f"Árvore salva em '{filename}.dot'.\n")
+
+
+# ------------------------------
+# Árvore em arrays paralelos
+NIL = -1
+
+class ArrayBinaryTree:
+    """
+    Mesma árvore e mesmas travessias de BinaryTree, mas com os nós guardados
+    em arrays paralelos (valores, filho esquerdo, filho direito) em vez de
+    objetos. Cada nó é um índice; NIL (-1) indica ausência de filho.
+
+    typecode define o tipo dos valores no array ('q' para inteiros de 64 bits,
+    'd' para floats). Como BinaryTree aqui não tem remoção, os nós só crescem
+    no fim dos arrays (a versão com remoção e lista livre está na atividade 2).
+    """
+
+    def __init__(self, typecode="q"):
+        self.values = array(typecode)
+        self.left = array("q")
+        self.right = array("q")
+        self.root = NIL
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, value):
+        return self.search(value)
+
+    def insert(self, value):
+        new = len(self.values)
+        self.values.append(value)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        if self.root == NIL:
+            self.root = new
+            return
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+        while True:
+            if value < values[current]:
+                if left[current] == NIL:
+                    left[current] = new
+                    return
+                current = left[current]
+            else:
+                if right[current] == NIL:
+                    right[current] = new
+                    return
+                current = right[current]
+
+    def search(self, value):
+        """True se o valor está na árvore (o índice do nó vem de find_index)."""
+        return self.find_index(value) is not None
+
+    def find_index(self, value):
+        """Índice do nó com o valor, ou None (atenção: o índice pode ser 0)."""
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+        while current != NIL and values[current] != value:
+            current = left[current] if value < values[current] else right[current]
+        return None if current == NIL else current
+
+    # ------------------------------
+    # Métodos de travessia (mesmos de BinaryTree)
+
+    def inorder(self):
+        return list(self.iter_inorder())
+
+    def preorder(self):
+        return list(self.iter_preorder())
+
+    def postorder(self):
+        return list(self.iter_postorder())
+
+    def levelorder(self):
+        return list(self.iter_levelorder())
+
+    def iter_inorder(self):
+        values, left, right = self.values, self.left, self.right
+        stack = []
+        current = self.root
+        while stack or current != NIL:
+            while current != NIL:
+                stack.append(current)
+                current = left[current]
+            current = stack.pop()
+            yield values[current]
+            current = right[current]
+
+    def iter_preorder(self):
+        values, left, right = self.values, self.left, self.right
+        stack = [self.root] if self.root != NIL else []
+        while stack:
+            current = stack.pop()
+            yield values[current]
+            if right[current] != NIL:
+                stack.append(right[current])
+            if left[current] != NIL:
+                stack.append(left[current])
+
+    def iter_postorder(self):
+        values, left, right = self.values, self.left, self.right
+        stack = []
+        current = self.root
+        last = NIL
+        while stack or current != NIL:
+            while current != NIL:
+                stack.append(current)
+                current = left[current]
+            top = stack[-1]
+            if right[top] != NIL and right[top] != last:
+                current = right[top]
+            else:
+                stack.pop()
+                last = top
+                yield values[top]
+
+    def iter_levelorder(self):
+        values, left, right = self.values, self.left, self.right
+        queue = deque([self.root] if self.root != NIL else [])
+        while queue:
+            current = queue.popleft()
+            yield values[current]
+            if left[current] != NIL:
+                queue.append(left[current])
+            if right[current] != NIL:
+                queue.append(right[current])
+
+
+def _dot_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_many(trees, format="png", cleanup=True):
+    """
+    Gera as imagens de várias árvores com uma única execução do Graphviz.
+    trees: {nome do arquivo sem extensão: BinaryTree}.
+    """
+    for filename, tree in trees.items():
+        tree.write_dot(f"{filename}.dot")
+    _run_dot(list(trees), format, cleanup)
+
+
+def _run_dot(filenames, format="png", cleanup=True):
+    executable = shutil.which("dot")
+    if executable is None:
+        raise RuntimeError("Executável 'dot' do Graphviz não encontrado no PATH")
+    # Com -O cada entrada gera '<entrada>.<formato>' (arvore.dot.png)
+    subprocess.run([executable, f"-T{format}", "-O", *(f"{name}.dot" for name in filenames)], check=True)
+    for name in filenames:
+        os.replace(f"{name}.dot.{format}", f"{name}.{format}")
+        if cleanup:
+            os.remove(f"{name}.dot")
 
 
 # ==========================================================
@@ -113,6 +435,7 @@ if __name__ == "__main__":
     print("In-Order (Esq-Raiz-Dir):", bt_fixa.inorder())
     print("Pre-Order (Raiz-Esq-Dir):", bt_fixa.preorder())
     print("Post-Order (Esq-Dir-Raiz):", bt_fixa.postorder())
+    print("Level-Order (Largura):", bt_fixa.levelorder())
 
     # ------------------------------
     # Árvore com valores randômicos
@@ -131,3 +454,4 @@ if __name__ == "__main__":
     print("In-Order (Esq-Raiz-Dir):", bt_random.inorder())
     print("Pre-Order (Raiz-Esq-Dir):", bt_random.preorder())
     print("Post-Order (Esq-Dir-Raiz):", bt_random.postorder())
+    print("Level-Order (Largura):", bt_random.levelorder())
@@ -0,0 +1,253 @@
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+
+from atividade_5 import AVLTree
+
+# ------------------------------
+# Árvore B+ com folhas encadeadas. Cada nó guarda muitas chaves em uma lista
+# ordenada (busca com bisect), então uma consulta percorre poucos níveis e
+# faz pouco "pointer chasing" em comparação com a AVL, que tem uma chave por nó.
+
+class LeafNode:
+    __slots__ = ("keys", "next")
+
+    def __init__(self, keys=None):
+        self.keys = keys if keys is not None else []
+        self.next = None
+
+
+class InternalNode:
+    # keys[i] é a menor chave de children[i + 1]
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys, children):
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree:
+    def __init__(self, order=64):
+        if order < 3:
+            raise ValueError("A ordem da árvore B+ deve ser pelo menos 3")
+        # Folhas guardam até `order` chaves; nós internos até `order` filhos.
+        self.order = order
+        self.min_leaf_keys = order // 2
+        self.min_children = (order + 1) // 2
+        self.root = LeafNode()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        return i < len(leaf.keys) and leaf.keys[i] == key
+
+    def height(self):
+        """Número de níveis (todas as folhas estão na mesma profundidade)."""
+        levels = 1
+        node = self.root
+        while isinstance(node, InternalNode):
+            node = node.children[0]
+            levels += 1
+        return levels
+
+    def _find_leaf(self, key):
+        node = self.root
+        while isinstance(node, InternalNode):
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def _path_to_leaf(self, key):
+        path = []
+        node = self.root
+        while isinstance(node, InternalNode):
+            index = bisect_right(node.keys, key)
+            path.append((node, index))
+            node = node.children[index]
+        return path, node
+
+    def insert(self, key):
+        path, leaf = self._path_to_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            raise ValueError("Chaves duplicadas não são permitidas na árvore B+")
+        leaf.keys.insert(i, key)
+        self._size += 1
+        if len(leaf.keys) <= self.order:
+            return
+
+        # Divide a folha e sobe a chave separadora; repete enquanto o pai
+        # também estourar.
+        mid = len(leaf.keys) // 2
+        new_node = LeafNode(leaf.keys[mid:])
+        del leaf.keys[mid:]
+        new_node.next = leaf.next
+        leaf.next = new_node
+        separator = new_node.keys[0]
+
+        while path:
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, new_node)
+            if len(parent.children) <= self.order:
+                return
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            new_node = InternalNode(parent.keys[mid + 1:], parent.children[mid + 1:])
+            del parent.keys[mid:]
+            del parent.children[mid + 1:]
+
+        self.root = InternalNode([separator], [self.root, new_node])
+
+    def delete(self, key):
+        path, leaf = self._path_to_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i == len(leaf.keys) or leaf.keys[i] != key:
+            return
+        del leaf.keys[i]
+        self._size -= 1
+
+        node = leaf
+        while path:
+            parent, index = path.pop()
+            if isinstance(node, LeafNode):
+                if len(node.keys) >= self.min_leaf_keys:
+                    return
+                self._fix_leaf(parent, index)
+            else:
+                if len(node.children) >= self.min_children:
+                    return
+                self._fix_internal(parent, index)
+            node = parent
+
+        if isinstance(self.root, InternalNode) and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+
+    def _fix_leaf(self, parent, index):
+        node = parent.children[index]
+        left = parent.children[index - 1] if index > 0 else None
+        right = parent.children[index + 1] if index + 1 < len(parent.children) else None
+
+        if left is not None and len(left.keys) > self.min_leaf_keys:
+            node.keys.insert(0, left.keys.pop())
+            parent.keys[index - 1] = node.keys[0]
+        elif right is not None and len(right.keys) > self.min_leaf_keys:
+            node.keys.append(right.keys.pop(0))
+            parent.keys[index] = right.keys[0]
+        elif left is not None:
+            left.keys.extend(node.keys)
+            left.next = node.next
+            del parent.keys[index - 1]
+            del parent.children[index]
+        else:
+            node.keys.extend(right.keys)
+            node.next = right.next
+            del parent.keys[index]
+            del parent.children[index + 1]
+
+    def _fix_internal(self, parent, index):
+        node = parent.children[index]
+        left = parent.children[index - 1] if index > 0 else None
+        right = parent.children[index + 1] if index + 1 < len(parent.children) else None
+
+        if left is not None and len(left.children) > self.min_children:
+            node.keys.insert(0, parent.keys[index - 1])
+            node.children.insert(0, left.children.pop())
+            parent.keys[index - 1] = left.keys.pop()
+        elif right is not None and len(right.children) > self.min_children:
+            node.keys.append(parent.keys[index])
+            node.children.append(right.children.pop(0))
+            parent.keys[index] = right.keys.pop(0)
+        elif left is not None:
+            left.keys.append(parent.keys.pop(index - 1))
+            left.keys.extend(node.keys)
+            left.children.extend(node.children)
+            del parent.children[index]
+        else:
+            node.keys.append(parent.keys.pop(index))
+            node.keys.extend(right.keys)
+            node.children.extend(right.children)
+            del parent.children[index + 1]
+
+    def iter_range(self, key1, key2):
+        """Gera as chaves em [key1, key2] seguindo o encadeamento das folhas."""
+        leaf = self._find_leaf(key1)
+        i = bisect_left(leaf.keys, key1)
+        while leaf is not None:
+            keys = leaf.keys
+            end = bisect_right(keys, key2)
+            yield from keys[i:end]
+            if end < len(keys):
+                return
+            leaf = leaf.next
+            i = 0
+
+    def find_nodes_in_range(self, key1, key2):
+        return list(self.iter_range(key1, key2))
+
+    def get_node_depth(self, key):
+        """Profundidade da folha que contém a chave, ou -1 se não existir."""
+        depth = 0
+        node = self.root
+        while isinstance(node, InternalNode):
+            node = node.children[bisect_right(node.keys, key)]
+            depth += 1
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            return depth
+        return -1
+
+
+# ------------------------------
+# Comparação direta com a AVL
+
+def compare_with_avl(num_keys=1_000_000, order=64, seed=0, lookups=200_000, ranges=2_000):
+    """
+    Mede inserção, busca, consulta por intervalo e remoção na AVLTree e na
+    BPlusTree com as mesmas chaves aleatórias. Devolve {estrutura: {operação:
+    segundos}}.
+    """
+    rng = random.Random(seed)
+    keys = rng.sample(range(num_keys * 10), num_keys)
+    probes = [rng.choice(keys) for _ in range(lookups)]
+    spans = [(k, k + 1000) for k in rng.sample(keys, ranges)]
+    removals = keys[: num_keys // 2]
+
+    results = {}
+    for name, tree in (("AVLTree", AVLTree()), (f"BPlusTree(order={order})", BPlusTree(order))):
+        timings = {}
+
+        start = time.perf_counter()
+        for key in keys:
+            tree.insert(key)
+        timings["insert"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in probes:
+            tree.get_node_depth(key)
+        timings["lookup"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key1, key2 in spans:
+            tree.find_nodes_in_range(key1, key2)
+        timings["range"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in removals:
+            tree.delete(key)
+        timings["delete"] = time.perf_counter() - start
+
+        results[name] = timings
+    return results
+
+
+if __name__ == "__main__":
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"\n--- AVL x Árvore B+ com {num_keys} chaves ---")
+    for name, timings in compare_with_avl(num_keys).items():
+        detalhes = ", ".join(f"{op}: {seconds:.2f}s" for op, seconds in timings.items())
+        print(f"{name}: {detalhes}")
@@ -1,11 +1,26 @@
+import math
+import mmap
+import random
+import struct
+import sys
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from itertools import islice
+
 class Node:
     def __init__(self, key):
         self.key = key
         self.left = None
         self.right = None
         self.height = 1
+        self.size = 1
 
 class AVLTree:
+    # Instrumentação desligada por padrão (ver enable_stats)
+    _stats = None
+
     def __init__(self):
         self.root = None
 
@@ -14,6 +29,14 @@ class AVLTree:
             return 0
         return node.height
     
+    def get_size(self, node):
+        if not node:
+            return 0
+        return node.size
+
+    def __len__(self):
+        return self.get_size(self.root)
+
     def get_balance(self, node):
         if not node:
             return 0
@@ -26,6 +49,7 @@ class AVLTree:
         left_height = node.left.height if node.left else 0
         right_height = node.right.height if node.right else 0
         node.height = 1 + max(left_height, right_height)
+        node.size = 1 + self.get_size(node.left) + self.get_size(node.right)
         return node.height
     
     def get_min_value_node(self, node):
@@ -41,8 +65,10 @@ class AVLTree:
         x.right = y
         y.left = T2
 
-        y.height = 1 + max(self.get_height(y.left), self.get_height(y.right))
-        x.height = 1 + max(self.get_height(x.left), self.get_height(x.right))
+        self._update_height(y)
+        self._update_height(x)
+        if self._stats is not None:
+            self._stats["rotations"]["right"] += 1
 
         return x
     
@@ -53,115 +79,1071 @@ class AVLTree:
         y.left = x
         x.right = T2
 
-        x.height = 1 + max(self.get_height(x.left), self.get_height(x.right))
-        y.height = 1 + max(self.get_height(y.left), self.get_height(y.right))
+        self._update_height(x)
+        self._update_height(y)
+        if self._stats is not None:
+            self._stats["rotations"]["left"] += 1
 
         return y
     
-    def insert(self, key):
-        self.root = self._recursive_insert(self.root, key)
+    def _rebalance(self, node):
+        """Aplica a rotação simples ou dupla necessária e devolve a nova raiz."""
+        balance = self.get_balance(node)
+        if self._stats is not None and abs(balance) > 1:
+            self._count_rebalance(node, balance)
+        if balance > 1:
+            if self.get_balance(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self.get_balance(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
 
-    def _recursive_insert(self, current_node, key):
-        if not current_node:
-            return Node(key)
-        
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _fix_path(self, path, delta):
+        """
+        Sobe pelo caminho (da folha para a raiz) atualizando alturas e
+        rebalanceando. Quando a altura de uma subárvore não muda, nada acima
+        dela precisa de rotação: o restante do caminho só ajusta o tamanho.
+        """
+        i = len(path) - 1
+        while i >= 0:
+            node = path[i]
+            old_height = node.height
+            self._update_height(node)
+            new_root = self._rebalance(node)
+            if new_root is not node:
+                self._replace_child(path[i - 1] if i else None, node, new_root)
+            i -= 1
+            if new_root.height == old_height:
+                break
+        while i >= 0:
+            path[i].size += delta
+            i -= 1
+
+    def insert(self, key):
+        path = []
+        current = self.root
+        while current:
+            path.append(current)
+            if key < current.key:
+                current = current.left
+            elif key > current.key:
+                current = current.right
+            else:
+                if self._stats is not None:
+                    self._count_insert_path(path, key)
+                raise ValueError("Chaves duplicadas não são permitidas em árvores AVL")
+        if self._stats is not None:
+            self._count_insert_path(path, key)
 
-        if key < current_node.key:
-            current_node.left = self._recursive_insert(current_node.left, key)
-        elif key > current_node.key:
-            current_node.right = self._recursive_insert(current_node.right, key)
+        new_node = Node(key)
+        if not path:
+            self.root = new_node
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
         else:
+            parent.right = new_node
+        self._fix_path(path, 1)
+
+    def delete(self, key):
+        path = []
+        current = self.root
+        while current and current.key != key:
+            path.append(current)
+            current = current.left if key < current.key else current.right
+        if not current:
+            if self._stats is not None:
+                self._count_path(len(path), 2 * len(path))
+            return
+        if self._stats is not None:
+            # Descida: duas comparações por ancestral e uma no nó achado
+            comparisons = 2 * len(path) + 1
+
+        if current.left and current.right:
+            # Copia o sucessor para o nó e remove o sucessor, que não tem filho
+            # à esquerda.
+            path.append(current)
+            successor = current.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            current.key = successor.key
+            current = successor
+
+        if self._stats is not None:
+            # path tem os nós acima do removido (ou do sucessor)
+            self._count_path(len(path) + 1, comparisons)
+        child = current.left if current.left else current.right
+        self._replace_child(path[-1] if path else None, current, child)
+        self._fix_path(path, -1)
+
+    def check_invariants(self):
+        """
+        Verifica ordem das chaves, alturas, tamanhos e fator de balanceamento
+        de todos os nós. Lança AssertionError na primeira violação.
+        """
+        stack = [(self.root, None, None, False)]
+        while stack:
+            node, low, high, visited = stack.pop()
+            if not node:
+                continue
+            if not visited:
+                if (low is not None and node.key <= low) or (high is not None and node.key >= high):
+                    raise AssertionError(f"Chave {node.key!r} fora da ordem da árvore")
+                stack.append((node, low, high, True))
+                stack.append((node.left, low, node.key, False))
+                stack.append((node.right, node.key, high, False))
+                continue
+            left_height = self.get_height(node.left)
+            right_height = self.get_height(node.right)
+            if node.height != 1 + max(left_height, right_height):
+                raise AssertionError(f"Altura incorreta no nó {node.key!r}")
+            if node.size != 1 + self.get_size(node.left) + self.get_size(node.right):
+                raise AssertionError(f"Tamanho incorreto no nó {node.key!r}")
+            if abs(left_height - right_height) > 1:
+                raise AssertionError(f"Nó {node.key!r} desbalanceado")
+        return True
+
+    # ------------------------------
+    # Instrumentação opcional. Desligada, as operações rodam sem nenhum
+    # invólucro e só testam `self._stats is not None` uma vez (as descidas
+    # de insert/delete/get_node_depth já guardam o caminho ou a
+    # profundidade, então a contagem sai deles no fim; _scan conta no
+    # próprio laço). Ligada, as operações públicas desta instância passam
+    # por um invólucro que mede o tempo e registra o que a operação contou.
+    # As operações em lote (insert_many, union, split...) registram tempo e
+    # rotações, mas não nós visitados nem comparações.
+
+    _INSTRUMENTED = ("insert", "delete", "get_node_depth", "find_nodes_in_range",
+                     "insert_many", "union", "intersection", "difference", "split", "join")
+
+    def enable_stats(self, callback=None):
+        """
+        Liga a instrumentação. callback(operação, registro) é chamado após
+        cada operação com tempo (ns), nós visitados e comparações.
+        """
+        self.reset_stats()
+        self._stats_callback = callback
+        for name in self._INSTRUMENTED:
+            setattr(self, name, self._instrument(name, getattr(type(self), name).__get__(self)))
+
+    def disable_stats(self):
+        for name in self._INSTRUMENTED:
+            self.__dict__.pop(name, None)
+        self._stats = None
+        self._stats_callback = None
+
+    def reset_stats(self):
+        self._stats = {
+            "operations": {},
+            "nodes_visited": 0,
+            "comparisons": 0,
+            "max_path_depth": 0,
+            "rotations": {"left": 0, "right": 0, "single": 0, "double": 0},
+        }
+
+    def stats(self):
+        """Cópia dos contadores (None se a instrumentação estiver desligada)."""
+        if self._stats is None:
+            return None
+        result = dict(self._stats)
+        result["rotations"] = dict(self._stats["rotations"])
+        result["operations"] = {
+            name: dict(op, avg_time_ns=op["total_time_ns"] / op["count"])
+            for name, op in self._stats["operations"].items()
+        }
+        return result
+
+    def _count_rebalance(self, node, balance):
+        child_balance = self.get_balance(node.left if balance > 1 else node.right)
+        double = child_balance < 0 if balance > 1 else child_balance > 0
+        self._stats["rotations"]["double" if double else "single"] += 1
+
+    def _count_path(self, visited, comparisons, depth=None):
+        """Soma o que uma descida (ou percurso) contou; depth padrão: visited."""
+        stats = self._stats
+        stats["nodes_visited"] += visited
+        stats["comparisons"] += comparisons
+        depth = visited if depth is None else depth
+        if depth > stats["max_path_depth"]:
+            stats["max_path_depth"] = depth
+
+    def _count_insert_path(self, path, key):
+        # Uma comparação (key <) onde desceu à esquerda; duas nos demais nós
+        self._count_path(len(path), sum(1 if key < node.key else 2 for node in path))
+
+    def _instrument(self, name, method):
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            stats = self._stats
+            visited = stats["nodes_visited"]
+            comparisons = stats["comparisons"]
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                op = stats["operations"].setdefault(name, {"count": 0, "total_time_ns": 0})
+                op["count"] += 1
+                op["total_time_ns"] += elapsed
+                if self._stats_callback is not None:
+                    self._stats_callback(name, {
+                        "time_ns": elapsed,
+                        "nodes_visited": stats["nodes_visited"] - visited,
+                        "comparisons": stats["comparisons"] - comparisons,
+                    })
+        return wrapper
+
+    # ------------------------------
+    # Operações em lote baseadas em join/split. Todas reaproveitam os nós
+    # das árvores envolvidas (são destrutivas) e trabalham em O(log n) por
+    # junção, em vez de uma inserção/remoção por chave.
+
+    def _new_node(self, key, left=None, right=None):
+        node = Node(key)
+        node.left = left
+        node.right = right
+        self._update_height(node)
+        return node
+
+    def _join_right(self, left, pivot, right):
+        # left é mais alta: desce pela borda direita até achar a altura de right
+        middle = left.right
+        if self.get_height(middle) <= self.get_height(right) + 1:
+            pivot.left = middle
+            pivot.right = right
+            self._update_height(pivot)
+            if pivot.height <= self.get_height(left.left) + 1:
+                left.right = pivot
+                self._update_height(left)
+                return left
+            left.right = self._rotate_right(pivot)
+            self._update_height(left)
+            return self._rotate_left(left)
+
+        joined = self._join_right(middle, pivot, right)
+        left.right = joined
+        self._update_height(left)
+        if joined.height <= self.get_height(left.left) + 1:
+            return left
+        return self._rotate_left(left)
+
+    def _join_left(self, left, pivot, right):
+        # Espelho de _join_right: right é mais alta
+        middle = right.left
+        if self.get_height(middle) <= self.get_height(left) + 1:
+            pivot.left = left
+            pivot.right = middle
+            self._update_height(pivot)
+            if pivot.height <= self.get_height(right.right) + 1:
+                right.left = pivot
+                self._update_height(right)
+                return right
+            right.left = self._rotate_left(pivot)
+            self._update_height(right)
+            return self._rotate_right(right)
+
+        joined = self._join_left(left, pivot, middle)
+        right.left = joined
+        self._update_height(right)
+        if joined.height <= self.get_height(right.right) + 1:
+            return right
+        return self._rotate_right(right)
+
+    def _join(self, left, pivot, right):
+        """Une left < pivot.key < right em uma AVL, em O(|h(left) - h(right)|)."""
+        if self.get_height(left) > self.get_height(right) + 1:
+            return self._join_right(left, pivot, right)
+        if self.get_height(right) > self.get_height(left) + 1:
+            return self._join_left(left, pivot, right)
+        pivot.left = left
+        pivot.right = right
+        self._update_height(pivot)
+        return pivot
+
+    def _split(self, node, key):
+        """Divide a subárvore em (< key, key presente?, > key)."""
+        if not node:
+            return None, False, None
+        left, right = node.left, node.right
+        if key == node.key:
+            return left, True, right
+        if key < node.key:
+            smaller, found, larger = self._split(left, key)
+            return smaller, found, self._join(larger, node, right)
+        smaller, found, larger = self._split(right, key)
+        return self._join(left, node, smaller), found, larger
+
+    def _split_last(self, node):
+        """Remove o maior nó da subárvore; devolve (subárvore restante, nó)."""
+        if not node.right:
+            return node.left, node
+        rest, last = self._split_last(node.right)
+        return self._join(node.left, node, rest), last
+
+    def _join2(self, left, right):
+        if not left:
+            return right
+        rest, last = self._split_last(left)
+        return self._join(rest, last, right)
+
+    def _union(self, a, b, collisions=None):
+        """União das subárvores; as chaves presentes nas duas vão para collisions."""
+        if not a:
+            return b
+        if not b:
+            return a
+        smaller, found, larger = self._split(b, a.key)
+        if found and collisions is not None:
+            collisions.append(a.key)
+        left = self._union(a.left, smaller, collisions)
+        right = self._union(a.right, larger, collisions)
+        return self._join(left, a, right)
+
+    def _intersection(self, a, b):
+        if not a or not b:
+            return None
+        smaller, found, larger = self._split(b, a.key)
+        left = self._intersection(a.left, smaller)
+        right = self._intersection(a.right, larger)
+        if found:
+            return self._join(left, a, right)
+        return self._join2(left, right)
+
+    def _difference(self, a, b):
+        if not a or not b:
+            return a
+        smaller, _, larger = self._split(a, b.key)
+        left = self._difference(smaller, b.left)
+        right = self._difference(larger, b.right)
+        return self._join2(left, right)
+
+    def _build_from_sorted(self, keys, lo=0, hi=None):
+        if hi is None:
+            hi = len(keys)
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        return self._new_node(
+            keys[mid],
+            self._build_from_sorted(keys, lo, mid),
+            self._build_from_sorted(keys, mid + 1, hi),
+        )
+
+    def _take_root(self, other):
+        root = other.root
+        other.root = None
+        return root
+
+    def split(self, key):
+        """
+        Divide a árvore em (chaves < key, key estava presente?, chaves > key).
+        Devolve duas novas AVLTree; esta árvore fica vazia.
+        """
+        smaller, found, larger = self._split(self._take_root(self), key)
+        left_tree, right_tree = AVLTree(), AVLTree()
+        left_tree.root = smaller
+        right_tree.root = larger
+        return left_tree, found, right_tree
+
+    def join(self, other):
+        """
+        Concatena other nesta árvore; todas as chaves de other devem ser
+        maiores que as desta. other fica vazia.
+        """
+        if self.root and other.root:
+            last = self.root
+            while last.right:
+                last = last.right
+            if last.key >= self.get_min_value_node(other.root).key:
+                raise ValueError("join exige que todas as chaves de other sejam maiores")
+        self.root = self._join2(self.root, self._take_root(other))
+
+    def union(self, other):
+        """Esta árvore passa a conter a união das chaves; other fica vazia."""
+        self.root = self._union(self.root, self._take_root(other))
+
+    def intersection(self, other):
+        """Mantém só as chaves também presentes em other; other fica vazia."""
+        self.root = self._intersection(self.root, self._take_root(other))
+
+    def difference(self, other):
+        """Remove as chaves presentes em other; other fica vazia."""
+        self.root = self._difference(self.root, self._take_root(other))
+
+    def insert_many(self, keys):
+        """
+        Insere um lote de chaves: ordena, monta uma AVL balanceada em O(m) e
+        faz a união com a árvore atual. Chaves já presentes são detectadas
+        durante a própria união; nesse caso as chaves novas são retiradas de
+        volta (a árvore fica com as chaves de antes) e ValueError é lançado.
+        """
+        keys = sorted(keys)
+        for i in range(1, len(keys)):
+            if keys[i] == keys[i - 1]:
+                raise ValueError("Chaves duplicadas não são permitidas em árvores AVL")
+        collisions = []
+        self.root = self._union(self.root, self._build_from_sorted(keys), collisions)
+        if collisions:
+            repeated = set(collisions)
+            added = [key for key in keys if key not in repeated]
+            self.root = self._difference(self.root, self._build_from_sorted(added))
             raise ValueError("Chaves duplicadas não são permitidas em árvores AVL")
-        
-        self._update_height(current_node)
 
-        balance = self.get_balance(current_node)
+    # ------------------------------
+    # Estatísticas de ordem: cada nó guarda o tamanho da sua subárvore
+    # (mantido por _update_height), então as consultas abaixo descem um único
+    # caminho da raiz, em O(log n).
 
-        if balance > 1 and key < current_node.left.key:
-            current_node.left = self._rotate_left(current_node.left)
-            return self._rotate_right(current_node)
-        
-        if balance < -1 and key < current_node.right.key:
-            current_node.right = self._rotate_right(current_node.right)
-            return self._rotate_left(current_node)
-        
-        return current_node
-    
-    def delete(self, key):
-        self.root = self._recursive_delete(self.root, key)
+    def _rank(self, key, inclusive):
+        count = 0
+        current = self.root
+        while current:
+            if key < current.key or (key == current.key and not inclusive):
+                current = current.left
+            else:
+                count += 1 + self.get_size(current.left)
+                current = current.right
+        return count
 
-    def _recursive_delete(self, current_node, key):
-        if not current_node:
-            return current_node
-        
-        if key < current_node.key:
-            current_node.left = self._recursive_delete(current_node.left, key)
-        elif key > current_node.key:
-            current_node.right = self._recursive_delete(current_node.right, key)
-        else:
-            if not current_node.left:
-                return current_node.right
-            elif not current_node.right:
-                return current_node.left
+    def rank(self, key):
+        """Quantidade de chaves menores que key."""
+        return self._rank(key, inclusive=False)
+
+    def select(self, k):
+        """k-ésima menor chave (k começa em 0)."""
+        if not 0 <= k < len(self):
+            raise IndexError("Posição fora da árvore")
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if k < left_size:
+                current = current.left
+            elif k == left_size:
+                return current.key
             else:
-                successor = self.get_min_value_node(current_node.right)
-                current_node.key = successor.key
-                current_node.right = self._recursive_delete(current_node.right, successor.key)
+                k -= left_size + 1
+                current = current.right
 
-        self._update_height(current_node)
+    def count_in_range(self, key1, key2):
+        """Quantidade de chaves em [key1, key2], sem listá-las."""
+        if key2 < key1:
+            return 0
+        return self._rank(key2, inclusive=True) - self._rank(key1, inclusive=False)
 
-        balance = self.get_balance(current_node)
+    def percentile(self, p):
+        """Chave no percentil p (0 a 100), pelo método do posto mais próximo."""
+        n = len(self)
+        if n == 0:
+            raise ValueError("Árvore vazia")
+        if not 0 <= p <= 100:
+            raise ValueError("O percentil deve estar entre 0 e 100")
+        k = max(0, math.ceil(p / 100 * n) - 1)
+        return self.select(k)
+
+    def median(self):
+        """Mediana (a menor das duas centrais quando n é par)."""
+        return self.percentile(50)
+
+    # ------------------------------
+    # Formato binário: cabeçalho + nós de largura fixa (chave, esquerda,
+    # direita, altura, tamanho) como inteiros de 64 bits little-endian, em
+    # ordem de largura. Os filhos são índices de nó (-1 = sem filho).
+
+    def save(self, path):
+        nodes = [self.root] if self.root else []
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            if node.left:
+                nodes.append(node.left)
+            if node.right:
+                nodes.append(node.right)
+            i += 1
+        index = {id(node): i for i, node in enumerate(nodes)}
+
+        data = array("q")
+        try:
+            for node in nodes:
+                data.append(node.key)
+                data.append(index[id(node.left)] if node.left else NIL)
+                data.append(index[id(node.right)] if node.right else NIL)
+                data.append(node.height)
+                data.append(node.size)
+        except (TypeError, OverflowError):
+            raise ValueError("O formato binário aceita apenas chaves inteiras de 64 bits")
+        if sys.byteorder == "big":
+            data.byteswap()
+
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(AVL_MAGIC, FORMAT_VERSION, len(nodes), 0 if nodes else NIL))
+            data.tofile(f)
+
+    @staticmethod
+    def load(path):
+        """Abre uma árvore salva com save() direto do arquivo (mmap)."""
+        return MappedAVLTree(path)
 
-        if balance > 1 and self.get_balance(current_node.left) >= 0:
-            return self._rotate_right(current_node)
-        
-        if balance > 1 and self.get_balance(current_node.left) < 0:
-            current_node.left = self._rotate_left(current_node.left)
-            return self._rotate_right(current_node)
-        
-        if balance < -1 and self._get_balance(current_node.right) <= 0:
-            return self._rotate_left(current_node)
-        
-        if balance < -1 and self.get_balance(current_node.left) > 0:
-            current_node.right = self._rotate_right(current_node.right)
-            return self._rotate_left(current_node)
-        
-        return current_node
-    
     def find_nodes_in_range(self, key1, key2):
-        result = []
+        return list(self.iter_range(key1, key2))
+
+    def _scan(self, low, low_inclusive, high, high_inclusive, reverse):
+        """
+        Percurso em ordem com pilha explícita, limitado a [low, high] (None =
+        sem limite). A pilha só guarda o caminho atual, O(log n) nós, e a
+        primeira chave sai depois de uma única descida da raiz.
+        """
+        # Com a instrumentação ligada, conta os nós tocados e as comparações
+        # com os limites (uma por nó para cada limite dado)
+        counting = self._stats is not None
+        visited = comparisons = descent = 0
+        stack = []
+        node = self.root
+        try:
+            if not reverse:
+                while node:
+                    if counting:
+                        visited += 1
+                        comparisons += low is not None
+                    if low is None or node.key > low or (low_inclusive and node.key == low):
+                        stack.append(node)
+                        node = node.left
+                    else:
+                        node = node.right
+                descent = visited
+                while stack:
+                    node = stack.pop()
+                    if counting:
+                        comparisons += high is not None
+                    if high is not None and (node.key > high or (node.key == high and not high_inclusive)):
+                        return
+                    yield node.key
+                    node = node.right
+                    while node:
+                        if counting:
+                            visited += 1
+                        stack.append(node)
+                        node = node.left
+            else:
+                while node:
+                    if counting:
+                        visited += 1
+                        comparisons += high is not None
+                    if high is None or node.key < high or (high_inclusive and node.key == high):
+                        stack.append(node)
+                        node = node.right
+                    else:
+                        node = node.left
+                descent = visited
+                while stack:
+                    node = stack.pop()
+                    if counting:
+                        comparisons += low is not None
+                    if low is not None and (node.key < low or (node.key == low and not low_inclusive)):
+                        return
+                    yield node.key
+                    node = node.left
+                    while node:
+                        if counting:
+                            visited += 1
+                        stack.append(node)
+                        node = node.right
+        finally:
+            # Também roda se o gerador for abandonado antes do fim (scan_from)
+            if counting and self._stats is not None:
+                self._count_path(visited, comparisons, depth=descent)
+
+    def iter_range(self, key1, key2, reverse=False):
+        """Gera as chaves em [key1, key2] sob demanda, em ordem crescente
+        (ou decrescente com reverse=True)."""
+        return self._scan(key1, True, key2, True, reverse)
+
+    def scan_from(self, cursor=None, limit=100, reverse=False):
+        """
+        Paginação: devolve (página, próximo cursor) com até limit chaves
+        depois de cursor (antes dele, se reverse). cursor=None começa do
+        início; o próximo cursor é None quando não há mais chaves. Cada página
+        custa O(log n + limit), independentemente de quantas já foram lidas.
+        """
+        if limit < 1:
+            raise ValueError("limit deve ser pelo menos 1")
+        if reverse:
+            keys = self._scan(None, True, cursor, False, True)
+        else:
+            keys = self._scan(cursor, False, None, True, False)
+        page = list(islice(keys, limit + 1))
+        if len(page) > limit:
+            page.pop()
+            return page, page[-1]
+        return page, None
 
-        def inorder(node):
-            if not node:
-                return
-            
-            if node.key > key1:
-                inorder(node.left)
-            
-            if key1 <= node.key <= key2:
-                result.append(node.key)
-            
-            if node.key < key2:
-                inorder(node.right)
-
-        inorder(self.root)
-        return result
-    
     def get_node_depth(self, key):
         depth = 0
         current = self.root
 
         while current:
             if key == current.key:
-                return depth
+                break
             elif key < current.key:
                 current = current.left
             else:
                 current = current.right
             depth += 1
-        
-        return -1
+
+        if self._stats is not None:
+            found = current is not None
+            self._count_path(depth + found, 2 * depth + found)
+        return depth if current else -1
     
+NIL = -1
+FILE_HEADER = struct.Struct("<4sIqq")  # magic, versão, nº de nós, raiz
+AVL_MAGIC = b"AVL1"
+FORMAT_VERSION = 1
+KEY, LEFT, RIGHT, HEIGHT, SIZE = range(5)
+
+
+class MappedAVLTree:
+    """
+    AVL salva por AVLTree.save, somente leitura, lida direto de um arquivo
+    mapeado em memória: abrir não desserializa nada, e cada consulta só toca
+    as páginas dos nós do caminho.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder == "big":
+            raise ValueError("Leitura mapeada suportada apenas em máquinas little-endian")
+        with open(path, "rb") as f:
+            # mmap recusa arquivo vazio com mensagem própria; checa o cabeçalho antes
+            if len(f.read(FILE_HEADER.size)) < FILE_HEADER.size:
+                raise ValueError(f"Arquivo '{path}' não é uma árvore AVL salva")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, root = FILE_HEADER.unpack_from(self._mmap)
+        if magic != AVL_MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Arquivo '{path}' não é uma árvore AVL salva")
+        # 5 inteiros de 64 bits por nó; arquivo truncado ou raiz fora dos nós
+        # falhariam só no meio de uma consulta
+        end = FILE_HEADER.size + count * 5 * 8
+        if count < 0 or len(self._mmap) < end or not (root == NIL if count == 0 else 0 <= root < count):
+            self._mmap.close()
+            raise ValueError(f"Arquivo '{path}' está truncado ou corrompido")
+        self._size = count
+        self.root = root
+        self._data = memoryview(self._mmap)[FILE_HEADER.size:end].cast("q")
+
+    def close(self):
+        self._data.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    def height(self):
+        return self._data[self.root * 5 + HEIGHT] if self.root != NIL else 0
+
+    def get_node_depth(self, key):
+        data = self._data
+        depth = 0
+        current = self.root
+        while current != NIL:
+            base = current * 5
+            node_key = data[base + KEY]
+            if key == node_key:
+                return depth
+            current = data[base + LEFT] if key < node_key else data[base + RIGHT]
+            depth += 1
+        return -1
+
+    def iter_range(self, key1, key2):
+        data = self._data
+        stack = []
+        current = self.root
+        while current != NIL:
+            if data[current * 5 + KEY] >= key1:
+                stack.append(current)
+                current = data[current * 5 + LEFT]
+            else:
+                current = data[current * 5 + RIGHT]
+        while stack:
+            current = stack.pop()
+            key = data[current * 5 + KEY]
+            if key > key2:
+                return
+            yield key
+            current = data[current * 5 + RIGHT]
+            while current != NIL:
+                stack.append(current)
+                current = data[current * 5 + LEFT]
+
+    def find_nodes_in_range(self, key1, key2):
+        return list(self.iter_range(key1, key2))
+
+    def _rank(self, key, inclusive):
+        data = self._data
+        count = 0
+        current = self.root
+        while current != NIL:
+            base = current * 5
+            node_key = data[base + KEY]
+            if key < node_key or (key == node_key and not inclusive):
+                current = data[base + LEFT]
+            else:
+                left = data[base + LEFT]
+                count += 1 + (data[left * 5 + SIZE] if left != NIL else 0)
+                current = data[base + RIGHT]
+        return count
+
+    def rank(self, key):
+        return self._rank(key, inclusive=False)
+
+    def count_in_range(self, key1, key2):
+        if key2 < key1:
+            return 0
+        return self._rank(key2, inclusive=True) - self._rank(key1, inclusive=False)
+
+
+class PersistentAVLTree(AVLTree):
+    """
+    AVL persistente: insert e delete não alteram a árvore, devolvem uma nova
+    versão. Só os O(log n) nós do caminho da raiz até a folha são copiados; o
+    resto é compartilhado entre as versões. Versões antigas continuam válidas
+    e podem ser lidas (busca, intervalo, rank...) sem nenhuma sincronização.
+    """
+
+    def _copy(self, node):
+        copy = Node(node.key)
+        copy.left = node.left
+        copy.right = node.right
+        copy.height = node.height
+        copy.size = node.size
+        return copy
+
+    def _copy_path(self, path):
+        copies = [self._copy(node) for node in path]
+        for i in range(1, len(path)):
+            if copies[i - 1].left is path[i]:
+                copies[i - 1].left = copies[i]
+            else:
+                copies[i - 1].right = copies[i]
+        return copies
+
+    def _rebalance(self, node):
+        # node já é uma cópia, mas os filhos que a rotação altera podem ser
+        # compartilhados com outras versões: copia-os antes de rotacionar.
+        balance = self.get_balance(node)
+        if self._stats is not None and abs(balance) > 1:
+            self._count_rebalance(node, balance)
+        if balance > 1:
+            node.left = self._copy(node.left)
+            if self.get_balance(node.left) < 0:
+                node.left.right = self._copy(node.left.right)
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            node.right = self._copy(node.right)
+            if self.get_balance(node.right) > 0:
+                node.right.left = self._copy(node.right.left)
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def insert(self, key):
+        path = []
+        current = self.root
+        while current:
+            path.append(current)
+            if key < current.key:
+                current = current.left
+            elif key > current.key:
+                current = current.right
+            else:
+                if self._stats is not None:
+                    self._count_insert_path(path, key)
+                raise ValueError("Chaves duplicadas não são permitidas em árvores AVL")
+        if self._stats is not None:
+            self._count_insert_path(path, key)
+
+        version = PersistentAVLTree()
+        new_node = Node(key)
+        if not path:
+            version.root = new_node
+            return version
+        copies = self._copy_path(path)
+        version.root = copies[0]
+        parent = copies[-1]
+        if key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        version._fix_path(copies, 1)
+        return version
+
+    def delete(self, key):
+        path = []
+        current = self.root
+        while current and current.key != key:
+            path.append(current)
+            current = current.left if key < current.key else current.right
+        if not current:
+            if self._stats is not None:
+                self._count_path(len(path), 2 * len(path))
+            return self
+
+        target = len(path)
+        path.append(current)
+        if current.left and current.right:
+            successor = current.right
+            while successor:
+                path.append(successor)
+                successor = successor.left
+        if self._stats is not None:
+            self._count_path(len(path), 2 * target + 1)
+
+        copies = self._copy_path(path)
+        version = PersistentAVLTree()
+        version.root = copies[0]
+        removed = copies.pop()
+        if len(copies) > target:
+            copies[target].key = removed.key
+        child = removed.left if removed.left else removed.right
+        version._replace_child(copies[-1] if copies else None, removed, child)
+        version._fix_path(copies, -1)
+        return version
+
+    def insert_many(self, keys):
+        """Nova versão com as chaves inseridas (montagem balanceada se vazia)."""
+        if self.root is None:
+            keys = sorted(keys)
+            for i in range(1, len(keys)):
+                if keys[i] == keys[i - 1]:
+                    raise ValueError("Chaves duplicadas não são permitidas em árvores AVL")
+            version = PersistentAVLTree()
+            version.root = self._build_from_sorted(keys)
+            return version
+        version = self
+        for key in keys:
+            version = version.insert(key)
+        return version
+
+    def _mutating(self, *args, **kwargs):
+        raise TypeError("Operação destrutiva não disponível em PersistentAVLTree")
+
+    split = join = union = intersection = difference = _mutating
+
+
+class _BatchWriter:
+    def __init__(self, version):
+        self.version = version
+
+    def insert(self, key):
+        self.version = self.version.insert(key)
+
+    def delete(self, key):
+        self.version = self.version.delete(key)
+
+    def insert_many(self, keys):
+        self.version = self.version.insert_many(keys)
+
+
+class ConcurrentAVLTree:
+    """
+    AVL para uso por várias threads. As leituras pegam a versão publicada
+    (uma PersistentAVLTree imutável) e não usam lock nenhum, então nunca
+    esperam por escritores. As escritas são serializadas por um lock e
+    publicam uma nova raiz ao final; com batch() várias escritas viram uma
+    única publicação, e os leitores veem o lote inteiro ou nada dele.
+    """
+
+    def __init__(self):
+        self._version = PersistentAVLTree()
+        self._write_lock = threading.Lock()
+
+    def snapshot(self):
+        """Versão atual, consistente, para várias leituras seguidas."""
+        return self._version
+
+    def __len__(self):
+        return len(self._version)
+
+    def get_node_depth(self, key):
+        return self._version.get_node_depth(key)
+
+    def find_nodes_in_range(self, key1, key2):
+        return self._version.find_nodes_in_range(key1, key2)
+
+    def iter_range(self, key1, key2, reverse=False):
+        return self._version.iter_range(key1, key2, reverse)
+
+    def scan_from(self, cursor=None, limit=100, reverse=False):
+        return self._version.scan_from(cursor, limit, reverse)
+
+    def count_in_range(self, key1, key2):
+        return self._version.count_in_range(key1, key2)
+
+    def rank(self, key):
+        return self._version.rank(key)
+
+    def select(self, k):
+        return self._version.select(k)
+
+    def insert(self, key):
+        with self._write_lock:
+            self._version = self._version.insert(key)
+
+    def delete(self, key):
+        with self._write_lock:
+            self._version = self._version.delete(key)
+
+    def insert_many(self, keys):
+        with self._write_lock:
+            self._version = self._version.insert_many(keys)
+
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa escritas: use o objeto devolvido (insert/delete/insert_many)
+        dentro do bloco. A nova versão só é publicada se o bloco terminar sem
+        erro. Não chame os métodos de escrita da própria árvore dentro do
+        bloco (o lock não é reentrante).
+        """
+        with self._write_lock:
+            writer = _BatchWriter(self._version)
+            yield writer
+            self._version = writer.version
+
+
+class _GlobalLockAVLTree:
+    # Referência para o benchmark: um lock único em volta de toda chamada.
+    def __init__(self):
+        self._tree = AVLTree()
+        self._lock = threading.Lock()
+
+    def get_node_depth(self, key):
+        with self._lock:
+            return self._tree.get_node_depth(key)
+
+    def insert_many(self, keys):
+        with self._lock:
+            self._tree.insert_many(keys)
+
+
+def benchmark_contention(num_keys=100_000, thread_counts=(1, 2, 4, 8), duration=1.0, batch_size=100):
+    """
+    Mede a vazão de leituras (get_node_depth) com N threads leitoras e um
+    escritor inserindo lotes de batch_size chaves o tempo todo, comparando
+    ConcurrentAVLTree com uma AVLTree protegida por um lock global.
+    Devolve uma lista de dicionários (implementação, threads, leituras/s).
+    """
+    results = []
+    for name, factory in (("global_lock", _GlobalLockAVLTree), ("concurrent", ConcurrentAVLTree)):
+        for threads in thread_counts:
+            tree = factory()
+            tree.insert_many(range(0, 2 * num_keys, 2))
+            stop = threading.Event()
+            counts = [0] * threads
+
+            def reader(slot):
+                rng = random.Random(slot)
+                done = 0
+                while not stop.is_set():
+                    for _ in range(100):
+                        tree.get_node_depth(rng.randrange(2 * num_keys))
+                    done += 100
+                counts[slot] = done
+
+            def writer():
+                next_key = 1
+                while not stop.is_set():
+                    tree.insert_many(range(next_key, next_key + 2 * batch_size, 2))
+                    next_key += 2 * batch_size
+                    time.sleep(0.001)
+
+            workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+            workers.append(threading.Thread(target=writer))
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            time.sleep(duration)
+            stop.set()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            results.append({
+                "implementation": name,
+                "threads": threads,
+                "reads_per_second": sum(counts) / elapsed,
+            })
+    return results
+
+
+def max_avl_height(n):
+    """Altura máxima de uma AVL com n nós (limite de Adelson-Velsky e Landis)."""
+    # A AVL mais alta de altura h tem N(h) = N(h-1) + N(h-2) + 1 nós.
+    height, smallest, previous = 0, 0, 0
+    while smallest <= n:
+        height += 1
+        smallest, previous = smallest + previous + 1, smallest
+    return height - 1
+
+
+def stress_test(operations=1_000_000, seed=0, key_order="random", check_every=10_000):
+    """
+    Executa inserções e remoções comparando com um set e verificando as
+    invariantes da árvore a cada check_every operações. key_order pode ser
+    "random", "sorted" ou "reversed" (chaves inseridas em ordem). Verifica
+    também que a altura nunca passa do limite teórico de uma AVL (~1,44 log2 n).
+    """
+    rng = random.Random(seed)
+    tree = AVLTree()
+    expected = set()
+    next_key = 0
+    for i in range(1, operations + 1):
+        if expected and rng.random() < 0.3:
+            key = tree.select(rng.randrange(len(tree)))
+            tree.delete(key)
+            expected.discard(key)
+        else:
+            if key_order == "random":
+                key = rng.randrange(operations * 4)
+            else:
+                key = next_key if key_order == "sorted" else -next_key
+                next_key += 1
+            # chave repetida pula só a inserção; a verificação abaixo ainda roda
+            if key not in expected:
+                tree.insert(key)
+                expected.add(key)
+
+        if i % check_every == 0 or i == operations:
+            tree.check_invariants()
+            if len(tree) != len(expected):
+                raise AssertionError("Quantidade de chaves diverge do esperado")
+            if tree.get_height(tree.root) > max_avl_height(len(tree)):
+                raise AssertionError("Altura acima do limite de uma AVL")
+
+    if tree.find_nodes_in_range(float("-inf"), float("inf")) != sorted(expected):
+        raise AssertionError("Conteúdo da árvore diverge do esperado")
+    return {"operations": operations, "keys": len(tree), "height": tree.get_height(tree.root)}
+
+
 if __name__ == "__main__":
     avl_tree = AVLTree()
 
@@ -207,3 +1189,38 @@ if __name__ == "__main__":
             print("Método `get_node_depth` ainda não implementado.")
     except Exception as e:
         print(f"\nERRO DURANTE O CÁLCULO DE PROFUNDIDADE: {e}")
+
+    print("\n--- 5. Operações em lote (join/split) ---")
+    try:
+        lote = AVLTree()
+        lote.insert_many([15, 3, 12, 7, 20])
+        outra = AVLTree()
+        outra.insert_many([7, 8, 20, 25])
+        lote.union(outra)
+        print(f"União: {lote.find_nodes_in_range(-100, 100)}")
+        menores, encontrado, maiores = lote.split(12)
+        print(f"Split em 12: {menores.find_nodes_in_range(-100, 100)} | "
+              f"{encontrado} | {maiores.find_nodes_in_range(-100, 100)}")
+    except Exception as e:
+        print(f"\nERRO DURANTE AS OPERAÇÕES EM LOTE: {e}")
+
+    print("\n--- 6. Estatísticas de ordem ---")
+    try:
+        print(f"Quantidade de nós em [1, 9]: {avl_tree.count_in_range(1, 9)}")
+        print(f"Menor chave: {avl_tree.select(0)} | Mediana: {avl_tree.median()}")
+        print(f"Posição (rank) do nó 6: {avl_tree.rank(6)}")
+    except Exception as e:
+        print(f"\nERRO DURANTE AS ESTATÍSTICAS DE ORDEM: {e}")
+
+    print("\n--- 7. Verificando invariantes (inserções e remoções aleatórias) ---")
+    try:
+        for ordem in ("random", "sorted"):
+            resultado = stress_test(20_000, seed=1, key_order=ordem, check_every=5_000)
+            print(f"{ordem}: {resultado['keys']} chaves, altura {resultado['height']}")
+    except AssertionError as e:
+        print(f"\nINVARIANTE VIOLADA: {e}")
+
+    print("\n--- 8. Versões persistentes ---")
+    v1 = PersistentAVLTree().insert_many([10, 20, 30])
+    v2 = v1.insert(25).delete(10)
+    print(f"Versão 1: {v1.find_nodes_in_range(0, 100)} | Versão 2: {v2.find_nodes_in_range(0, 100)}")
@@ -1,16 +1,37 @@
+import time
 import tkinter as tk
-from tkinter import messagebox
-from collections import deque
+from tkinter import filedialog, messagebox
+from renderizador import RenderizadorGrade
+from solucionador import Grade, PAREDE, ALGORITMOS, carregar_labirinto, salvar_labirinto
 
 # --- Configurações da Grade e Cores ---
 class Configuracoes:
     # Tamanho da grade (colunas x linhas)
     COLUNAS = 30
     LINHAS = 20
-    # Tamanho de cada célula em pixels
+    # Tamanho de cada célula em pixels (muda com o zoom: Ctrl + roda do mouse)
     TAMANHO_CELULA = 25
-    # Tempo de atraso para a animação do BFS em milissegundos
+    # Tamanho máximo da área visível do Canvas; grades maiores ganham rolagem
+    LARGURA_MAXIMA_VISTA = 900
+    ALTURA_MAXIMA_VISTA = 650
+    # Intervalo entre quadros da animação da busca em milissegundos
     TEMPO_ANIMACAO_MS = 50
+    # Na velocidade 'Máxima', tempo de busca por quadro (o resto fica para o Tk)
+    ORCAMENTO_QUADRO_MS = 25
+    # Células expandidas por quadro; None = quantas couberem no orçamento
+    VELOCIDADES = {
+        '1 célula/quadro': 1,
+        '10 células/quadro': 10,
+        '100 células/quadro': 100,
+        'Máxima': None,
+    }
+
+    # Tipos de arquivo: texto ('#', ' ', 'S', 'E') ou binário compacto (1 bit por célula)
+    TIPOS_ARQUIVO = (
+        ("Labirinto em texto", "*.txt"),
+        ("Labirinto binário", "*.lab"),
+        ("Todos os arquivos", "*.*"),
+    )
 
     # Paleta de Cores
     CORES = {
@@ -22,6 +43,9 @@ class Configuracoes:
         'Visitado': "#D6EAF8",  # Azul Pálido (Já Visitado)
         'Caminho Final': "#FFD700", # Dourado
     }
+    # Ordem da paleta do renderizador: o código de cada cor é sua posição
+    ORDEM_CORES = ('Caminho', 'Parede', 'Inicio', 'Fim', 'Fronteira', 'Visitado', 'Caminho Final')
+    CODIGOS = {nome: codigo for codigo, nome in enumerate(ORDEM_CORES)}
     
     # Mapeamento de Ferramenta para Caractere e Cor
     FERRAMENTAS = {
@@ -34,7 +58,7 @@ class Configuracoes:
 class MazeEditorGUI:
     def __init__(self, root):
         self.root = root
-        root.title("Solucionador de Labirintos (BFS)")
+        root.title("Solucionador de Labirintos")
         
         # Variáveis de Estado da Aplicação
         self.modo_edicao = True
@@ -42,18 +66,19 @@ class MazeEditorGUI:
         self.fim_pos = None
         self.job_after = None   # ID para a função agendada do Tkinter (animação)
 
-        # Variáveis do Algoritmo BFS
-        self.fila = deque()
-        self.visitados = set()
-        self.predecessores = {} # predecessor[(l, c)] = (l_origem, c_origem)
+        # Busca em andamento (motor em solucionador.py, sem dependência do Tk)
+        self.busca = None
 
-        # Inicializa o modelo de dados (matriz 2D)
-        self.labirinto = [[' ' for _ in range(Configuracoes.COLUNAS)] for _ in range(Configuracoes.LINHAS)]
-        # Inicializa o armazenamento das IDs dos objetos do Canvas
-        self.grid_cells = [[None for _ in range(Configuracoes.COLUNAS)] for _ in range(Configuracoes.LINHAS)]
+        # Inicializa o modelo de dados (paredes da grade; 'S' e 'E' ficam em inicio_pos/fim_pos)
+        self.grade = Grade(Configuracoes.LINHAS, Configuracoes.COLUNAS)
 
         # Variável para o Radiobutton da ferramenta de edição
         self.tool_var = tk.StringVar(value='Caminho') # Caminho como ferramenta padrão
+        # Algoritmo de busca escolhido (chaves de ALGORITMOS)
+        self.algoritmo_var = tk.StringVar(value='BFS')
+        # Velocidade da animação (chaves de Configuracoes.VELOCIDADES) e modo instantâneo
+        self.velocidade_var = tk.StringVar(value='1 célula/quadro')
+        self.instantaneo_var = tk.BooleanVar(value=False)
 
         self._configurar_gui()
         self.desenhar_grid_inicial()
@@ -64,13 +89,19 @@ class MazeEditorGUI:
         main_frame = tk.Frame(self.root)
         main_frame.pack(padx=10, pady=10)
 
-        # --- Canvas para o Labirinto (Grid) ---
-        self.canvas = tk.Canvas(main_frame, 
-                                width=Configuracoes.COLUNAS * Configuracoes.TAMANHO_CELULA, 
-                                height=Configuracoes.LINHAS * Configuracoes.TAMANHO_CELULA, 
+        # --- Canvas para o Labirinto (Grid), com barras de rolagem ---
+        canvas_frame = tk.Frame(main_frame)
+        canvas_frame.pack(side=tk.LEFT, padx=10)
+        self.canvas = tk.Canvas(canvas_frame, 
+                                width=min(Configuracoes.COLUNAS * Configuracoes.TAMANHO_CELULA, Configuracoes.LARGURA_MAXIMA_VISTA), 
+                                height=min(Configuracoes.LINHAS * Configuracoes.TAMANHO_CELULA, Configuracoes.ALTURA_MAXIMA_VISTA), 
                                 bg=Configuracoes.CORES['Caminho'], 
                                 bd=0, highlightthickness=0)
-        self.canvas.pack(side=tk.LEFT, padx=10)
+        self.barra_x = tk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL)
+        self.barra_y = tk.Scrollbar(canvas_frame, orient=tk.VERTICAL)
+        self.canvas.grid(row=0, column=0)
+        self.barra_y.grid(row=0, column=1, sticky='ns')
+        self.barra_x.grid(row=1, column=0, sticky='ew')
 
         # --- Frame para os Controles (Toolbox) ---
         control_frame = tk.Frame(main_frame)
@@ -93,8 +124,19 @@ class MazeEditorGUI:
         # Separador
         tk.Frame(control_frame, height=2, bg="gray").pack(fill='x', pady=10)
         
+        # Seleção do Algoritmo de Busca
+        tk.Label(control_frame, text="Algoritmo:", font=('Arial', 10, 'bold')).pack()
+        self.menu_algoritmo = tk.OptionMenu(control_frame, self.algoritmo_var, *ALGORITMOS)
+        self.menu_algoritmo.pack(fill='x', padx=5, pady=(0, 5))
+
+        # Velocidade da animação e modo sem animação
+        tk.Label(control_frame, text="Velocidade:", font=('Arial', 10, 'bold')).pack()
+        self.menu_velocidade = tk.OptionMenu(control_frame, self.velocidade_var, *Configuracoes.VELOCIDADES)
+        self.menu_velocidade.pack(fill='x', padx=5, pady=(0, 5))
+        tk.Checkbutton(control_frame, text="Resolver sem animação", variable=self.instantaneo_var, anchor='w').pack(fill='x', padx=5)
+
         # Botões de Ação
-        self.btn_iniciar = tk.Button(control_frame, text="Iniciar Busca (BFS)", command=self.iniciar_busca, bg='#4CAF50', fg='white')
+        self.btn_iniciar = tk.Button(control_frame, text="Iniciar Busca", command=self.iniciar_busca, bg='#4CAF50', fg='white')
         self.btn_iniciar.pack(fill='x', padx=5, pady=5)
         
         self.btn_resetar = tk.Button(control_frame, text="Resetar Busca", command=self.resetar_busca, bg='#FFA500', fg='white')
@@ -102,6 +144,13 @@ class MazeEditorGUI:
 
         self.btn_limpar = tk.Button(control_frame, text="Limpar Labirinto", command=self.limpar_labirinto, bg='#F44336', fg='white')
         self.btn_limpar.pack(fill='x', padx=5, pady=5)
+
+        # Arquivos de labirinto
+        self.btn_abrir = tk.Button(control_frame, text="Abrir Labirinto", command=self.abrir_arquivo)
+        self.btn_abrir.pack(fill='x', padx=5, pady=(15, 5))
+
+        self.btn_salvar = tk.Button(control_frame, text="Salvar Labirinto", command=self.salvar_arquivo)
+        self.btn_salvar.pack(fill='x', padx=5, pady=5)
         
         # Status
         tk.Label(control_frame, text="Status:", font=('Arial', 10, 'bold')).pack(pady=(10, 0))
@@ -109,40 +158,68 @@ class MazeEditorGUI:
         self.status_label.pack()
 
     def desenhar_grid_inicial(self):
-        """Desenha todos os retângulos no Canvas e armazena suas IDs."""
-        for r in range(Configuracoes.LINHAS):
-            for c in range(Configuracoes.COLUNAS):
-                x1 = c * Configuracoes.TAMANHO_CELULA
-                y1 = r * Configuracoes.TAMANHO_CELULA
-                x2 = x1 + Configuracoes.TAMANHO_CELULA
-                y2 = y1 + Configuracoes.TAMANHO_CELULA
-                
-                # Desenha o retângulo inicial (Caminho)
-                cell_id = self.canvas.create_rectangle(x1, y1, x2, y2, 
-                                                       fill=Configuracoes.CORES['Caminho'], 
-                                                       outline="#CCCCCC") # Borda cinza clara
-                self.grid_cells[r][c] = cell_id
+        """Cria o renderizador em blocos de imagem (só a parte visível é desenhada)."""
+        self.renderizador = RenderizadorGrade(self.canvas, 
+                                              Configuracoes.LINHAS, 
+                                              Configuracoes.COLUNAS, 
+                                              [Configuracoes.CORES[nome] for nome in Configuracoes.ORDEM_CORES], 
+                                              Configuracoes.TAMANHO_CELULA)
+        self.renderizador.conectar_barras(self.barra_x, self.barra_y)
+
+    def _carregar_visual(self):
+        """Redesenha a grade inteira a partir do modelo (usado ao abrir um arquivo)."""
+        grade = self.grade
+        # Tamanho de célula que faz o labirinto caber na vista (o zoom continua livre)
+        tamanho = max(1, min(Configuracoes.TAMANHO_CELULA, 
+                             Configuracoes.LARGURA_MAXIMA_VISTA // grade.colunas, 
+                             Configuracoes.ALTURA_MAXIMA_VISTA // grade.linhas))
+        self.canvas.config(width=min(grade.colunas * tamanho, Configuracoes.LARGURA_MAXIMA_VISTA), 
+                           height=min(grade.linhas * tamanho, Configuracoes.ALTURA_MAXIMA_VISTA))
+        self.renderizador.redimensionar(grade.linhas, grade.colunas, tamanho)
+
+        # As células da grade (LIVRE/PAREDE) viram códigos da paleta linha a linha
+        tabela = bytes(Configuracoes.CODIGOS['Parede'] if b == PAREDE else Configuracoes.CODIGOS['Caminho'] 
+                       for b in range(256))
+        self.renderizador.carregar_base(grade.linha(linha).translate(tabela) for linha in range(grade.linhas))
+        for pos, char in ((self.inicio_pos, 'S'), (self.fim_pos, 'E')):
+            if pos:
+                self._atualizar_celula_visual(*pos, char)
 
     def bind_eventos(self):
         """Configura os manipuladores de eventos do mouse."""
         self.canvas.bind('<Button-1>', self.on_canvas_click)
         self.canvas.bind('<B1-Motion>', self.on_canvas_drag)
+        # Roda do mouse rola a grade; com Ctrl, aplica zoom (Button-4/5 no X11)
+        self.canvas.bind('<MouseWheel>', self.on_canvas_roda)
+        self.canvas.bind('<Button-4>', self.on_canvas_roda)
+        self.canvas.bind('<Button-5>', self.on_canvas_roda)
+        self.canvas.bind('<Control-MouseWheel>', self.on_canvas_zoom)
+        self.canvas.bind('<Control-Button-4>', self.on_canvas_zoom)
+        self.canvas.bind('<Control-Button-5>', self.on_canvas_zoom)
 
     def on_canvas_click(self, event):
         """Manipulador de clique (Button-1)."""
-        if self.modo_edicao:
-            col = event.x // Configuracoes.TAMANHO_CELULA
-            row = event.y // Configuracoes.TAMANHO_CELULA
-            self.editar_celula(row, col)
+        celula = self.renderizador.celula_em(event.x, event.y)
+        if self.modo_edicao and celula:
+            self.editar_celula(*celula)
 
     def on_canvas_drag(self, event):
         """Manipulador de arrasto (B1-Motion)."""
-        if self.modo_edicao:
-            col = event.x // Configuracoes.TAMANHO_CELULA
-            row = event.y // Configuracoes.TAMANHO_CELULA
-            # Verifica se a posição é válida dentro da grade
-            if 0 <= row < Configuracoes.LINHAS and 0 <= col < Configuracoes.COLUNAS:
-                self.editar_celula(row, col)
+        # celula_em devolve None fora da grade
+        celula = self.renderizador.celula_em(event.x, event.y)
+        if self.modo_edicao and celula:
+            self.editar_celula(*celula)
+
+    def on_canvas_roda(self, event):
+        """Rolagem vertical com a roda do mouse."""
+        para_cima = event.num == 4 or event.delta > 0
+        self.renderizador.rolar_y('scroll', -3 if para_cima else 3, 'units')
+
+    def on_canvas_zoom(self, event):
+        """Zoom com Ctrl + roda do mouse, centrado no cursor."""
+        aproximar = event.num == 4 or event.delta > 0
+        self.renderizador.zoom(1.25 if aproximar else 0.8, event.x, event.y)
+        self.renderizador.aplicar()
 
     def editar_celula(self, row, col):
         """Atualiza a célula no modelo de dados e visualmente."""
@@ -154,8 +231,10 @@ class MazeEditorGUI:
 
         novo_char = tool_data['char']
         
+        atual_char = self._char_celula(row, col)
+
         # Se a célula atual é a mesma que queremos desenhar, não faz nada
-        if self.labirinto[row][col] == novo_char and novo_char not in ('S', 'E'):
+        if atual_char == novo_char and novo_char not in ('S', 'E'):
             return
 
         # 1. Lidar com a regra de 'S' e 'E' únicos
@@ -163,57 +242,58 @@ class MazeEditorGUI:
             if self.inicio_pos and self.inicio_pos != (row, col):
                 # Limpa o 'S' antigo
                 r_old, c_old = self.inicio_pos
-                self._atualizar_celula_visual(r_old, c_old, ' ', Configuracoes.CORES['Caminho'])
-                self.labirinto[r_old][c_old] = ' '
+                self._atualizar_celula_visual(r_old, c_old, ' ')
+            if self.fim_pos == (row, col):
+                self.fim_pos = None
             self.inicio_pos = (row, col)
         elif novo_char == 'E':
             if self.fim_pos and self.fim_pos != (row, col):
                 # Limpa o 'E' antigo
                 r_old, c_old = self.fim_pos
-                self._atualizar_celula_visual(r_old, c_old, ' ', Configuracoes.CORES['Caminho'])
-                self.labirinto[r_old][c_old] = ' '
+                self._atualizar_celula_visual(r_old, c_old, ' ')
+            if self.inicio_pos == (row, col):
+                self.inicio_pos = None
             self.fim_pos = (row, col)
         
         # Se estamos apagando um 'S' ou 'E' (colocando 'Caminho'), atualiza a posição armazenada E limpa o texto
-        elif self.labirinto[row][col] == 'S':
+        elif atual_char == 'S':
             self.inicio_pos = None
             self._limpar_texto_celula(row, col) # CORREÇÃO: Limpar o texto ao apagar 'S'
-        elif self.labirinto[row][col] == 'E':
+        elif atual_char == 'E':
             self.fim_pos = None
             self._limpar_texto_celula(row, col) # CORREÇÃO: Limpar o texto ao apagar 'E'
 
         # 2. Atualizar o modelo de dados e a visualização
-        self.labirinto[row][col] = novo_char
-        self._atualizar_celula_visual(row, col, novo_char, tool_data['cor'])
+        self.grade.definir(row, col, novo_char == '#')
+        self._atualizar_celula_visual(row, col, novo_char)
+
+    def _char_celula(self, row, col):
+        """Caractere da célula no formato texto ('#', ' ', 'S' ou 'E')."""
+        if (row, col) == self.inicio_pos:
+            return 'S'
+        if (row, col) == self.fim_pos:
+            return 'E'
+        return '#' if self.grade.e_parede(row, col) else ' '
         
     def _limpar_texto_celula(self, row, col):
         """Remove o objeto de texto ('S' ou 'E') da célula no Canvas."""
-        # Deleta qualquer objeto no canvas que tenha a tag específica de texto
-        self.canvas.delete(f"text_{row}_{col}")
+        self.renderizador.definir_marcador(row, col, None)
         
-    def _atualizar_celula_visual(self, row, col, char, cor):
-        """Atualiza a cor da célula no Canvas."""
-        cell_id = self.grid_cells[row][col]
-        self.canvas.itemconfig(cell_id, fill=cor)
+    def _atualizar_celula_visual(self, row, col, char):
+        """Atualiza a cor da célula (e o texto de 'S'/'E') no renderizador."""
+        tool_name = next(nome for nome, dados in Configuracoes.FERRAMENTAS.items() if dados['char'] == char)
+        # Editar depois de uma busca descarta a cor da busca na célula, senão a base não aparece
+        self.renderizador.remover_sobreposicao(row, col)
+        self.renderizador.definir_base(row, col, Configuracoes.CODIGOS[tool_name])
         
-        # 1. Remove texto antigo (sempre removemos antes de desenhar novo)
-        self._limpar_texto_celula(row, col)
-        
-        # 2. Adicionar texto para 'S' e 'E', se aplicável
-        if char in ('S', 'E'):
-            # Calcula o centro da célula para posicionar o texto
-            center_x = col * Configuracoes.TAMANHO_CELULA + Configuracoes.TAMANHO_CELULA / 2
-            center_y = row * Configuracoes.TAMANHO_CELULA + Configuracoes.TAMANHO_CELULA / 2
-            
-            # Adiciona novo texto com uma tag única
-            text_id = self.canvas.create_text(center_x, center_y, text=char, fill='black', font=('Arial', 10, 'bold'), tags=f"text_{row}_{col}")
-            # Garante que o texto está acima do retângulo
-            self.canvas.tag_raise(text_id)
-
-    # --- Lógica de Busca BFS ---
+        # Texto para 'S' e 'E'; nas demais células o texto antigo é removido
+        self.renderizador.definir_marcador(row, col, char if char in ('S', 'E') else None)
+        self.renderizador.aplicar()
+
+    # --- Lógica de Busca ---
 
     def iniciar_busca(self):
-        """Prepara o estado e inicia a animação do BFS."""
+        """Prepara o estado e inicia a animação da busca escolhida."""
         if not self.inicio_pos or not self.fim_pos:
             messagebox.showerror("Erro", "O labirinto deve ter um ponto de Início (S) e um de Fim (E)!")
             return
@@ -221,88 +301,98 @@ class MazeEditorGUI:
         # Desabilita o modo de edição e controles
         self.modo_edicao = False
         self._set_controles_edicao(False)
-        self.status_label.config(text="Simulação BFS em progresso...", fg="orange")
+        algoritmo = self.algoritmo_var.get()
+        self.status_label.config(text=f"Simulação {algoritmo} em progresso...", fg="orange")
         self.btn_iniciar.config(state=tk.DISABLED)
         self.btn_resetar.config(state=tk.NORMAL)
 
-        # Garante que os resultados de uma busca anterior sejam limpos
+        # Garante que os resultados de uma busca anterior sejam limpos (lógica e cores)
         self.resetar_busca(apenas_logica=True)
+        self.renderizador.limpar_sobreposicao()
+        self.renderizador.aplicar()
         
-        # Inicializa BFS com a posição de início
-        self.fila.append(self.inicio_pos)
-        self.visitados.add(self.inicio_pos)
-        # O predecessor de 'S' pode ser None, mas o set 'visitados' já o contém.
+        # O modelo já é a grade do solucionador (as buscas não a alteram)
+        self.busca = ALGORITMOS[algoritmo](self.grade, self.inicio_pos, self.fim_pos)
+
+        # Modo instantâneo: resolve de uma vez e pinta só o resultado final
+        if self.instantaneo_var.get():
+            self.busca.resolver()
+            self._concluir_busca()
+            return
 
-        # Inicia a animação agendando o primeiro passo
-        self.job_after = self.root.after(Configuracoes.TEMPO_ANIMACAO_MS, self.processar_passo_bfs)
+        # Inicia a animação agendando o primeiro quadro
+        self.job_after = self.root.after(Configuracoes.TEMPO_ANIMACAO_MS, self.processar_quadro)
 
-    def processar_passo_bfs(self):
-        """Executa um único passo do algoritmo BFS e agenda o próximo."""
+    def processar_quadro(self):
+        """
+        Executa os passos da busca que cabem em um quadro (N células ou o
+        orçamento de tempo), pinta as mudanças de uma vez e agenda o próximo.
+        """
         self.job_after = None # Limpa o job ID antes de iniciar um novo
 
-        if not self.fila:
-            self.status_label.config(text="Caminho não encontrado!", fg="red")
-            self._set_controles_edicao(True)
-            self.btn_iniciar.config(state=tk.NORMAL)
+        busca = self.busca
+        maximo = Configuracoes.VELOCIDADES[self.velocidade_var.get()]
+        limite = time.perf_counter() + Configuracoes.ORCAMENTO_QUADRO_MS / 1000
+        pontas = (busca.inicio, busca.fim)
+        visitado = Configuracoes.CODIGOS['Visitado']
+        fronteira = Configuracoes.CODIGOS['Fronteira']
+
+        # 1. Expande células acumulando a cor final de cada uma neste quadro;
+        #    uma célula que entra e sai da fronteira no mesmo quadro é pintada uma vez só
+        cores = {}
+        passos = 0
+        while True:
+            resultado = busca.passo()
+            if resultado is None or busca.encontrado:
+                break
+            atual, novos = resultado
+            if atual not in pontas:
+                cores[atual] = visitado
+            for vizinho in novos:
+                if vizinho not in pontas:
+                    cores[vizinho] = fronteira
+            passos += 1
+            if maximo is not None:
+                if passos >= maximo:
+                    break
+            elif time.perf_counter() >= limite:
+                break
+
+        # 2. Aplica as mudanças do quadro (só as células em blocos visíveis são desenhadas)
+        posicao = busca.grade.posicao
+        for indice, codigo in cores.items():
+            self.renderizador.sobrepor(*posicao(indice), codigo)
+        self.renderizador.aplicar()
+
+        # 3. Encerra a busca ou agenda o próximo quadro
+        if busca.terminado:
+            self._concluir_busca()
             return
-
-        # 1. Retira o item atual da fila
-        r, c = self.fila.popleft()
-        
-        # Se for o 'E', paramos a busca
-        if (r, c) == self.fim_pos:
-            self.status_label.config(text="Caminho encontrado!", fg="green")
+        intervalo = 1 if maximo is None else Configuracoes.TEMPO_ANIMACAO_MS
+        self.job_after = self.root.after(intervalo, self.processar_quadro)
+
+    def _concluir_busca(self):
+        """Mostra o resultado da busca e devolve os controles de edição."""
+        busca = self.busca
+        detalhes = f"{busca.expandidos} células expandidas"
+        if busca.tempo:
+            detalhes += f" em {busca.tempo * 1000:.1f} ms"
+        if busca.encontrado:
+            self.status_label.config(text=f"Caminho encontrado!\n{detalhes}", fg="green")
             self.reconstruir_caminho()
-            self._set_controles_edicao(True)
-            self.btn_iniciar.config(state=tk.NORMAL)
-            return
-
-        # 2. Pinta a célula atual como 'Visitada', a menos que seja 'S'
-        if (r, c) != self.inicio_pos:
-            self.canvas.itemconfig(self.grid_cells[r][c], fill=Configuracoes.CORES['Visitado'])
-
-        # 3. Explora os vizinhos (cima, baixo, esquerda, direita)
-        movimentos = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        
-        for dr, dc in movimentos:
-            nr, nc = r + dr, c + dc
-            vizinho_pos = (nr, nc)
-            
-            # 4. Verifica se o vizinho é válido e não visitado
-            if (0 <= nr < Configuracoes.LINHAS and 
-                0 <= nc < Configuracoes.COLUNAS and 
-                self.labirinto[nr][nc] != Configuracoes.FERRAMENTAS['Parede']['char'] and 
-                vizinho_pos not in self.visitados):
-
-                # Marca como visitado e salva o predecessor
-                self.visitados.add(vizinho_pos)
-                self.predecessores[vizinho_pos] = (r, c)
-                
-                # Adiciona à fila e pinta como 'Fronteira' (a menos que seja 'E')
-                self.fila.append(vizinho_pos)
-                if vizinho_pos != self.fim_pos:
-                    self.canvas.itemconfig(self.grid_cells[nr][nc], fill=Configuracoes.CORES['Fronteira'])
-                    
-        # 5. Agenda o próximo passo
-        self.job_after = self.root.after(Configuracoes.TEMPO_ANIMACAO_MS, self.processar_passo_bfs)
+        else:
+            self.status_label.config(text=f"Caminho não encontrado!\n{detalhes}", fg="red")
+        self._set_controles_edicao(True)
+        self.btn_iniciar.config(state=tk.NORMAL)
 
     def reconstruir_caminho(self):
         """Rastreia e colore o caminho mais curto encontrado de E até S."""
-        caminho_cor = Configuracoes.CORES['Caminho Final']
-        
-        # Inicia no 'E'
-        passo_atual = self.fim_pos
+        caminho_codigo = Configuracoes.CODIGOS['Caminho Final']
         
-        # Rastreia de volta usando o dicionário de predecessores
-        while passo_atual and passo_atual != self.inicio_pos:
-            r, c = passo_atual
-            
-            # Pinta apenas se não for o 'E' (já está vermelho)
-            if passo_atual != self.fim_pos:
-                self.canvas.itemconfig(self.grid_cells[r][c], fill=caminho_cor)
-            
-            # Move para o predecessor
-            passo_atual = self.predecessores.get(passo_atual)
+        # Pinta o caminho entre 'S' e 'E' (as pontas mantêm suas cores)
+        for r, c in self.busca.caminho()[1:-1]:
+            self.renderizador.sobrepor(r, c, caminho_codigo)
+        self.renderizador.aplicar()
 
     def resetar_busca(self, apenas_logica=False):
         """Para a animação e limpa as cores de simulação, mantendo o labirinto."""
@@ -311,36 +401,15 @@ class MazeEditorGUI:
             self.root.after_cancel(self.job_after)
             self.job_after = None
 
-        # 2. Limpa o estado lógico do BFS
-        self.fila.clear()
-        self.visitados.clear()
-        self.predecessores.clear()
+        # 2. Descarta o estado lógico da busca
+        self.busca = None
         
         if apenas_logica:
             return
 
-        # 3. Restaura as cores originais da grade (mantendo 'Parede', 'S', 'E')
-        for r in range(Configuracoes.LINHAS):
-            for c in range(Configuracoes.COLUNAS):
-                char = self.labirinto[r][c]
-                cell_id = self.grid_cells[r][c]
-                cor = Configuracoes.FERRAMENTAS.get(char, {}).get('cor', Configuracoes.CORES['Caminho'])
-                
-                # Verifica se a célula tem um estado de busca (visitado, fronteira, final)
-                is_search_state = cor in [Configuracoes.CORES['Visitado'], Configuracoes.CORES['Fronteira'], Configuracoes.CORES['Caminho Final']]
-                
-                if is_search_state or char in (' ', '#'):
-                    # Recalcula a cor base
-                    if char == '#':
-                        cor = Configuracoes.CORES['Parede']
-                    elif char == 'S':
-                        cor = Configuracoes.CORES['Inicio']
-                    elif char == 'E':
-                        cor = Configuracoes.CORES['Fim']
-                    else: # ' '
-                        cor = Configuracoes.CORES['Caminho']
-
-                    self.canvas.itemconfig(cell_id, fill=cor)
+        # 3. Restaura as cores originais só nas células pintadas pela busca
+        self.renderizador.limpar_sobreposicao()
+        self.renderizador.aplicar()
 
         # 4. Restaura o modo de edição e controles
         self.status_label.config(text="Pronto para Edição", fg="blue")
@@ -351,22 +420,55 @@ class MazeEditorGUI:
         """Limpa toda a grade para o estado 'Caminho'."""
         self.resetar_busca() # Limpa o estado da busca primeiro
         
+        # Remove os textos de 'S' e 'E' antes de esquecer suas posições
+        for pos in (self.inicio_pos, self.fim_pos):
+            if pos:
+                self._limpar_texto_celula(*pos)
+
         # Limpa o modelo de dados e as posições de 'S' e 'E'
-        self.labirinto = [[' ' for _ in range(Configuracoes.COLUNAS)] for _ in range(Configuracoes.LINHAS)]
+        self.grade = Grade(self.grade.linhas, self.grade.colunas)
         self.inicio_pos = None
         self.fim_pos = None
 
-        # Limpa a visualização
-        for r in range(Configuracoes.LINHAS):
-            for c in range(Configuracoes.COLUNAS):
-                cell_id = self.grid_cells[r][c]
-                self.canvas.itemconfig(cell_id, fill=Configuracoes.CORES['Caminho'])
-                
-                # CORREÇÃO: Remove o objeto de texto 'S' ou 'E' da célula
-                self._limpar_texto_celula(r, c)
+        # Limpa a visualização: só as células que não estavam como 'Caminho' são redesenhadas
+        self.renderizador.limpar_base()
+        self.renderizador.aplicar()
 
         self.status_label.config(text="Labirinto Limpo. Pronto para desenhar.", fg="black")
 
+    # --- Arquivos ---
+
+    def abrir_arquivo(self):
+        """Carrega um labirinto de arquivo texto ou binário (.lab)."""
+        caminho = filedialog.askopenfilename(title="Abrir Labirinto", filetypes=Configuracoes.TIPOS_ARQUIVO)
+        if not caminho:
+            return
+        try:
+            grade, inicio, fim = carregar_labirinto(caminho)
+        except (OSError, ValueError) as erro:
+            messagebox.showerror("Erro", f"Não foi possível abrir o labirinto:\n{erro}")
+            return
+
+        self.resetar_busca()
+        self.grade = grade
+        self.inicio_pos = inicio
+        self.fim_pos = fim
+        self._carregar_visual()
+        self.status_label.config(text=f"Labirinto aberto ({grade.linhas} x {grade.colunas})", fg="blue")
+
+    def salvar_arquivo(self):
+        """Salva o labirinto; a extensão '.lab' escolhe o formato binário."""
+        caminho = filedialog.asksaveasfilename(title="Salvar Labirinto", defaultextension=".txt", 
+                                               filetypes=Configuracoes.TIPOS_ARQUIVO)
+        if not caminho:
+            return
+        try:
+            salvar_labirinto(caminho, self.grade, self.inicio_pos, self.fim_pos)
+        except OSError as erro:
+            messagebox.showerror("Erro", f"Não foi possível salvar o labirinto:\n{erro}")
+            return
+        self.status_label.config(text="Labirinto salvo.", fg="blue")
+
     def _set_controles_edicao(self, enabled):
         """Habilita/desabilita controles de edição."""
         self.modo_edicao = enabled
@@ -376,6 +478,10 @@ class MazeEditorGUI:
             rb.config(state=state)
         
         self.btn_limpar.config(state=state)
+        self.btn_abrir.config(state=state)
+        self.btn_salvar.config(state=state)
+        self.menu_algoritmo.config(state=state)
+        self.menu_velocidade.config(state=state)
 
 
 if __name__ == "__main__":
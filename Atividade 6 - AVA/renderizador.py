@@ -0,0 +1,262 @@
+import tkinter as tk
+
+# --- Renderização da Grade em Blocos de Imagem ---
+# Em vez de um retângulo do Canvas por célula, a grade é desenhada em blocos
+# de PhotoImage com cerca de TAMANHO_BLOCO_PX pixels de lado. Cada célula é só
+# um código de cor (índice na paleta): uma camada base (o labirinto) e uma
+# camada de sobreposição esparsa (cores da busca). Só os blocos visíveis
+# existem como imagem; mudanças de cor ficam pendentes até aplicar(), que faz
+# um put() por célula alterada nos blocos na tela. Blocos fora da tela são
+# desenhados do estado atual quando aparecem.
+
+TAMANHO_BLOCO_PX = 512
+COR_LINHAS = "#CCCCCC"
+# Abaixo deste tamanho de célula (em pixels) as linhas da grade somem
+TAMANHO_MINIMO_LINHAS = 6
+TAMANHO_MINIMO = 1
+TAMANHO_MAXIMO = 60
+
+
+class RenderizadorGrade:
+    def __init__(self, canvas, linhas, colunas, cores, tamanho_celula):
+        """
+        cores: lista de cores da paleta; o código 0 é a cor padrão das células.
+        """
+        self.canvas = canvas
+        self.linhas = linhas
+        self.colunas = colunas
+        self.cores = list(cores)
+        self.base = bytearray(linhas * colunas)
+        self._base_alteradas = set()   # células com base diferente de 0 (None = desconhecidas)
+        self.sobreposicao = {}          # índice -> código por cima da base
+        self._pendentes = {}            # índice -> código ainda não desenhado
+        self._blocos = {}               # (bloco_linha, bloco_coluna) -> (imagem, id)
+        self._marcadores = {}           # (linha, coluna) -> texto ('S', 'E')
+        self.tamanho = None
+        canvas.bind('<Configure>', lambda event: self.atualizar_visiveis())
+        self.definir_tamanho(tamanho_celula)
+
+    # --- Estado das células ---
+
+    def definir_base(self, linha, coluna, codigo):
+        indice = linha * self.colunas + coluna
+        if self.base[indice] == codigo:
+            return
+        self.base[indice] = codigo
+        if self._base_alteradas is None:
+            pass
+        elif codigo:
+            self._base_alteradas.add(indice)
+        else:
+            self._base_alteradas.discard(indice)
+        if indice not in self.sobreposicao:
+            self._pendentes[indice] = codigo
+
+    def sobrepor(self, linha, coluna, codigo):
+        indice = linha * self.colunas + coluna
+        if self.sobreposicao.get(indice) != codigo:
+            self.sobreposicao[indice] = codigo
+            self._pendentes[indice] = codigo
+
+    def remover_sobreposicao(self, linha, coluna):
+        """Volta uma célula pintada pela busca à cor base."""
+        indice = linha * self.colunas + coluna
+        if self.sobreposicao.pop(indice, None) is not None:
+            self._pendentes[indice] = self.base[indice]
+
+    def limpar_sobreposicao(self):
+        """Volta à cor base só as células pintadas pela busca."""
+        base = self.base
+        for indice in self.sobreposicao:
+            self._pendentes[indice] = base[indice]
+        self.sobreposicao.clear()
+
+    def carregar_base(self, linhas):
+        """
+        Define a base inteira de uma vez (uma sequência de bytes de códigos
+        por linha) e redesenha só os blocos visíveis.
+        """
+        colunas = self.colunas
+        for linha, codigos in enumerate(linhas):
+            self.base[linha * colunas:(linha + 1) * colunas] = codigos
+        self._base_alteradas = None
+        self._pendentes.clear()
+        self._redesenhar()
+
+    def limpar_base(self):
+        """Volta ao código 0 só as células da base que estavam diferentes."""
+        if self._base_alteradas is None:
+            # Depois de carregar_base() não se sabe quais são: zera tudo
+            self.base = bytearray(len(self.base))
+            self._base_alteradas = set()
+            self._pendentes.clear()
+            self._redesenhar()
+            return
+        for indice in self._base_alteradas:
+            self.base[indice] = 0
+            if indice not in self.sobreposicao:
+                self._pendentes[indice] = 0
+        self._base_alteradas.clear()
+
+    def definir_marcador(self, linha, coluna, texto):
+        """Texto sobre a célula (ou None para remover)."""
+        self.canvas.delete(f"text_{linha}_{coluna}")
+        if texto is None:
+            self._marcadores.pop((linha, coluna), None)
+        else:
+            self._marcadores[(linha, coluna)] = texto
+            self._desenhar_marcador(linha, coluna, texto)
+
+    def aplicar(self):
+        """Desenha as mudanças pendentes nos blocos visíveis."""
+        tamanho = self.tamanho
+        por_bloco = self.celulas_por_bloco
+        borda = 1 if tamanho >= TAMANHO_MINIMO_LINHAS else 0
+        cores = self.cores
+        blocos = self._blocos
+        colunas = self.colunas
+        for indice, codigo in self._pendentes.items():
+            linha, coluna = divmod(indice, colunas)
+            bloco = blocos.get((linha // por_bloco, coluna // por_bloco))
+            if bloco is None:
+                continue
+            x = (coluna % por_bloco) * tamanho
+            y = (linha % por_bloco) * tamanho
+            bloco[0].put(cores[codigo], to=(x + borda, y + borda, x + tamanho, y + tamanho))
+        self._pendentes.clear()
+
+    # --- Visualização: blocos, rolagem e zoom ---
+
+    def definir_tamanho(self, tamanho):
+        """Muda o tamanho da célula em pixels e redesenha o que estiver visível."""
+        tamanho = max(TAMANHO_MINIMO, min(TAMANHO_MAXIMO, int(tamanho)))
+        if tamanho == self.tamanho:
+            return
+        self.tamanho = tamanho
+        self.celulas_por_bloco = max(1, TAMANHO_BLOCO_PX // tamanho)
+        self._redesenhar()
+
+    def redimensionar(self, linhas, colunas, tamanho):
+        """Troca as dimensões da grade; todas as células voltam ao código 0, sem marcadores."""
+        self.linhas = linhas
+        self.colunas = colunas
+        self.base = bytearray(linhas * colunas)
+        self._base_alteradas = set()
+        self.sobreposicao.clear()
+        self._pendentes.clear()
+        self._marcadores.clear()
+        self.tamanho = max(TAMANHO_MINIMO, min(TAMANHO_MAXIMO, int(tamanho)))
+        self.celulas_por_bloco = max(1, TAMANHO_BLOCO_PX // self.tamanho)
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self._redesenhar()
+
+    def _redesenhar(self):
+        """Descarta os blocos e marcadores desenhados e refaz a parte visível."""
+        tamanho = self.tamanho
+        self.canvas.delete('bloco')
+        self._blocos.clear()
+        self.canvas.configure(scrollregion=(0, 0, self.colunas * tamanho, self.linhas * tamanho))
+        self.canvas.delete('marcador')
+        for (linha, coluna), texto in self._marcadores.items():
+            self._desenhar_marcador(linha, coluna, texto)
+        self.atualizar_visiveis()
+
+    def zoom(self, fator, x=0, y=0):
+        """Aplica o zoom mantendo fixo o ponto (x, y) da janela."""
+        antigo = self.tamanho
+        novo = max(TAMANHO_MINIMO, min(TAMANHO_MAXIMO, round(antigo * fator)))
+        if novo == antigo:
+            novo = max(TAMANHO_MINIMO, min(TAMANHO_MAXIMO, antigo + (1 if fator > 1 else -1)))
+        mundo_x = self.canvas.canvasx(x) / antigo
+        mundo_y = self.canvas.canvasy(y) / antigo
+        self.definir_tamanho(novo)
+        self.canvas.xview_moveto(max(0.0, (mundo_x * novo - x) / (self.colunas * novo)))
+        self.canvas.yview_moveto(max(0.0, (mundo_y * novo - y) / (self.linhas * novo)))
+        self.atualizar_visiveis()
+
+    def conectar_barras(self, barra_x, barra_y):
+        """Liga as barras de rolagem ao Canvas, redesenhando ao rolar."""
+        self.canvas.configure(xscrollcommand=barra_x.set, yscrollcommand=barra_y.set)
+        barra_x.configure(command=self.rolar_x)
+        barra_y.configure(command=self.rolar_y)
+
+    def rolar_x(self, *args):
+        self.canvas.xview(*args)
+        self.atualizar_visiveis()
+
+    def rolar_y(self, *args):
+        self.canvas.yview(*args)
+        self.atualizar_visiveis()
+
+    def celula_em(self, x, y):
+        """(linha, coluna) sob o ponto (x, y) da janela, ou None se fora da grade."""
+        coluna = int(self.canvas.canvasx(x) // self.tamanho)
+        linha = int(self.canvas.canvasy(y) // self.tamanho)
+        if 0 <= linha < self.linhas and 0 <= coluna < self.colunas:
+            return linha, coluna
+        return None
+
+    def atualizar_visiveis(self):
+        """Cria os blocos que entraram na tela e descarta os que saíram."""
+        canvas = self.canvas
+        lado = self.celulas_por_bloco * self.tamanho
+        largura = canvas.winfo_width()
+        altura = canvas.winfo_height()
+        if largura <= 1:   # janela ainda não mapeada
+            largura = int(canvas.cget('width'))
+            altura = int(canvas.cget('height'))
+        x0, y0 = canvas.canvasx(0), canvas.canvasy(0)
+        ultimo_x = (self.colunas - 1) // self.celulas_por_bloco
+        ultimo_y = (self.linhas - 1) // self.celulas_por_bloco
+        visiveis = {
+            (bloco_y, bloco_x)
+            for bloco_y in range(max(0, int(y0 // lado)), min(ultimo_y, int((y0 + altura) // lado)) + 1)
+            for bloco_x in range(max(0, int(x0 // lado)), min(ultimo_x, int((x0 + largura) // lado)) + 1)
+        }
+        for chave in [chave for chave in self._blocos if chave not in visiveis]:
+            canvas.delete(self._blocos.pop(chave)[1])
+        for chave in visiveis:
+            if chave not in self._blocos:
+                self._desenhar_bloco(*chave)
+
+    def _desenhar_bloco(self, bloco_y, bloco_x):
+        por_bloco = self.celulas_por_bloco
+        tamanho = self.tamanho
+        l0, c0 = bloco_y * por_bloco, bloco_x * por_bloco
+        l1, c1 = min(l0 + por_bloco, self.linhas), min(c0 + por_bloco, self.colunas)
+
+        # Monta a imagem com 1 pixel por célula e amplia com zoom()
+        cores = self.cores
+        base = self.base
+        sobreposicao = self.sobreposicao
+        linhas_cores = []
+        for linha in range(l0, l1):
+            inicio = linha * self.colunas
+            codigos = base[inicio + c0:inicio + c1]
+            if sobreposicao:
+                codigos = [sobreposicao.get(inicio + coluna, codigos[coluna - c0]) for coluna in range(c0, c1)]
+            linhas_cores.append("{" + " ".join([cores[codigo] for codigo in codigos]) + "}")
+        imagem = tk.PhotoImage(width=c1 - c0, height=l1 - l0)
+        imagem.put(" ".join(linhas_cores))
+        if tamanho > 1:
+            imagem = imagem.zoom(tamanho)
+
+        if tamanho >= TAMANHO_MINIMO_LINHAS:
+            largura, altura = (c1 - c0) * tamanho, (l1 - l0) * tamanho
+            for coluna in range(c1 - c0):
+                imagem.put(COR_LINHAS, to=(coluna * tamanho, 0, coluna * tamanho + 1, altura))
+            for linha in range(l1 - l0):
+                imagem.put(COR_LINHAS, to=(0, linha * tamanho, largura, linha * tamanho + 1))
+
+        item = self.canvas.create_image(c0 * tamanho, l0 * tamanho, image=imagem, anchor='nw', tags='bloco')
+        self.canvas.tag_lower(item)
+        self._blocos[(bloco_y, bloco_x)] = (imagem, item)
+
+    def _desenhar_marcador(self, linha, coluna, texto):
+        tamanho = self.tamanho
+        if tamanho < 10:
+            return
+        self.canvas.create_text((coluna + 0.5) * tamanho, (linha + 0.5) * tamanho, text=texto,
+                                fill='black', font=('Arial', max(6, tamanho * 2 // 5), 'bold'),
+                                tags=(f"text_{linha}_{coluna}", 'marcador'))
@@ -0,0 +1,817 @@
+import mmap
+import random
+import struct
+import sys
+import time
+from array import array
+from heapq import heappop, heappush
+
+# --- Representação da Grade ---
+# A grade é um bytearray plano com uma borda de paredes em volta: a célula
+# (linha, coluna) fica no índice (linha + 1) * largura + (coluna + 1), com
+# largura = colunas + 2. Assim os vizinhos são só índice ± 1 e índice ± largura,
+# sem testes de limite.
+
+LIVRE = 0
+PAREDE = 1
+
+# Na busca, cada célula guarda um byte: 0 = ainda não alcançada, 1..4 = direção
+# pela qual foi alcançada (índice em deslocamentos + 1), ORIGEM para o início e
+# BLOQUEADA para paredes. Esse único bytearray faz o papel de "visitados" e de
+# "predecessores". Na busca bidirecional o lado do fim usa 6..9 e DESTINO.
+ORIGEM = 5
+DESTINO = 10
+BLOQUEADA = 255
+# Custo (g) de células ainda não alcançadas no A*
+SEM_CUSTO = 2 ** 31 - 1
+
+# Tabela de bytes.translate: '#' vira PAREDE, qualquer outro caractere vira LIVRE
+TABELA_TEXTO = bytes(PAREDE if b == ord('#') else LIVRE for b in range(256))
+_TABELA_BUSCA = bytes(BLOQUEADA if b == PAREDE else 0 for b in range(256))
+# De células para texto ('#'/' ') e para bits ('1'/'0'), e de bits para células
+_TABELA_PARA_TEXTO = bytes(ord('#') if b == PAREDE else ord(' ') for b in range(256))
+_TABELA_PARA_BITS = bytes(ord('1') if b == PAREDE else ord('0') for b in range(256))
+_TABELA_DE_BITS = bytes(PAREDE if b == ord('1') else LIVRE for b in range(256))
+
+# Formato binário: cabeçalho + uma linha por vez, 1 bit por célula (1 = parede,
+# bit mais significativo = coluna mais à esquerda), cada linha completada até
+# o byte seguinte. Posições ausentes de S/E são gravadas como -1.
+CABECALHO = struct.Struct("<4sIIIiiii")  # mágico, versão, linhas, colunas, S, E
+MAGICO = b"LAB1"
+VERSAO = 1
+
+
+class Grade:
+    def __init__(self, linhas, colunas):
+        if linhas <= 0 or colunas <= 0:
+            raise ValueError("A grade deve ter pelo menos uma linha e uma coluna")
+        self.linhas = linhas
+        self.colunas = colunas
+        self.largura = colunas + 2
+        self.celulas = bytearray([PAREDE]) * (self.largura * (linhas + 2))
+        vazia = bytes(colunas)
+        for linha in range(linhas):
+            inicio = self.indice(linha, 0)
+            self.celulas[inicio:inicio + colunas] = vazia
+
+    @property
+    def deslocamentos(self):
+        """Deslocamentos de índice para cima, baixo, esquerda e direita."""
+        return (-self.largura, self.largura, -1, 1)
+
+    def indice(self, linha, coluna):
+        return (linha + 1) * self.largura + coluna + 1
+
+    def posicao(self, indice):
+        linha, coluna = divmod(indice, self.largura)
+        return linha - 1, coluna - 1
+
+    def e_parede(self, linha, coluna):
+        return self.celulas[self.indice(linha, coluna)] == PAREDE
+
+    def definir(self, linha, coluna, parede):
+        self.celulas[self.indice(linha, coluna)] = PAREDE if parede else LIVRE
+
+    def definir_linha(self, linha, dados):
+        """Copia uma linha inteira já convertida (bytes de LIVRE/PAREDE)."""
+        inicio = self.indice(linha, 0)
+        self.celulas[inicio:inicio + self.colunas] = dados
+
+    def linha(self, linha):
+        """Bytes (LIVRE/PAREDE) de uma linha, sem a borda."""
+        inicio = self.indice(linha, 0)
+        return bytes(self.celulas[inicio:inicio + self.colunas])
+
+    @classmethod
+    def de_matriz(cls, matriz):
+        """
+        Converte a matriz de caracteres do editor ('#', ' ', 'S', 'E').
+        Devolve (grade, posição de S, posição de E); posições ausentes são None.
+        """
+        grade = cls(len(matriz), len(matriz[0]))
+        inicio = fim = None
+        for linha, celulas in enumerate(matriz):
+            texto = "".join(celulas)
+            grade.definir_linha(linha, texto.encode("latin-1").translate(TABELA_TEXTO))
+            if 'S' in texto:
+                inicio = (linha, texto.index('S'))
+            if 'E' in texto:
+                fim = (linha, texto.index('E'))
+        return grade, inicio, fim
+
+    @classmethod
+    def aleatoria(cls, linhas, colunas, densidade=0.3, semente=None):
+        """Grade com cada célula sendo parede com probabilidade ~densidade."""
+        limite = int(densidade * 256)
+        tabela = bytes(PAREDE if b < limite else LIVRE for b in range(256))
+        dados = random.Random(semente).randbytes(linhas * colunas).translate(tabela)
+        grade = cls(linhas, colunas)
+        for linha in range(linhas):
+            grade.definir_linha(linha, dados[linha * colunas:(linha + 1) * colunas])
+        return grade
+
+    # --- Arquivos ---
+
+    def salvar_texto(self, caminho, inicio=None, fim=None):
+        """Grava uma linha de texto por linha da grade ('#', ' ', 'S', 'E')."""
+        with open(caminho, "wb") as f:
+            for linha in range(self.linhas):
+                texto = self.linha(linha).translate(_TABELA_PARA_TEXTO)
+                for posicao, marca in ((inicio, b"S"), (fim, b"E")):
+                    if posicao and posicao[0] == linha:
+                        texto = texto[:posicao[1]] + marca + texto[posicao[1] + 1:]
+                f.write(texto + b"\n")
+
+    @classmethod
+    def carregar_texto(cls, caminho):
+        """
+        Lê um labirinto em texto linha a linha (duas passadas: uma para as
+        dimensões, outra para preencher a grade). Linhas mais curtas são
+        completadas com caminho livre. Devolve (grade, S, E).
+        """
+        linhas = colunas = 0
+        with open(caminho, "rb") as f:
+            for texto in f:
+                linhas += 1
+                colunas = max(colunas, len(texto.rstrip(b"\r\n")))
+        grade = cls(linhas, colunas)
+        inicio = fim = None
+        with open(caminho, "rb") as f:
+            for linha, texto in enumerate(f):
+                texto = texto.rstrip(b"\r\n")
+                if b"S" in texto:
+                    inicio = (linha, texto.index(b"S"))
+                if b"E" in texto:
+                    fim = (linha, texto.index(b"E"))
+                grade.definir_linha(linha, texto.translate(TABELA_TEXTO).ljust(colunas, bytes([LIVRE])))
+        return grade, inicio, fim
+
+    def salvar_binario(self, caminho, inicio=None, fim=None):
+        """Grava no formato compacto de 1 bit por célula (ver CABECALHO)."""
+        bytes_por_linha = (self.colunas + 7) // 8
+        with open(caminho, "wb") as f:
+            f.write(CABECALHO.pack(MAGICO, VERSAO, self.linhas, self.colunas,
+                                   *(inicio or (-1, -1)), *(fim or (-1, -1))))
+            for linha in range(self.linhas):
+                bits = self.linha(linha).translate(_TABELA_PARA_BITS).ljust(bytes_por_linha * 8, b"0")
+                f.write(int(bits, 2).to_bytes(bytes_por_linha, "big"))
+
+    @staticmethod
+    def carregar_binario(caminho):
+        """Lê um arquivo binário (via mmap, linha a linha). Devolve (grade, S, E)."""
+        with GradeMapeada(caminho) as mapeada:
+            return mapeada.para_grade(), mapeada.inicio, mapeada.fim
+
+
+class GradeMapeada:
+    """
+    Labirinto binário salvo por Grade.salvar_binario, somente leitura, lido
+    direto de um arquivo mapeado em memória: abrir não lê as células, e
+    e_parede()/linha() só tocam as páginas necessárias.
+    """
+
+    def __init__(self, caminho):
+        with open(caminho, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < CABECALHO.size:
+            self._mmap.close()
+            raise ValueError(f"Arquivo '{caminho}' não é um labirinto binário")
+        magico, versao, linhas, colunas, sl, sc, el, ec = CABECALHO.unpack_from(self._mmap)
+        self.bytes_por_linha = (colunas + 7) // 8
+        if magico != MAGICO or versao != VERSAO or \
+                len(self._mmap) < CABECALHO.size + linhas * self.bytes_por_linha:
+            self._mmap.close()
+            raise ValueError(f"Arquivo '{caminho}' não é um labirinto binário")
+        self.linhas = linhas
+        self.colunas = colunas
+        self.inicio = (sl, sc) if sl >= 0 else None
+        self.fim = (el, ec) if el >= 0 else None
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def e_parede(self, linha, coluna):
+        byte = self._mmap[CABECALHO.size + linha * self.bytes_por_linha + coluna // 8]
+        return bool(byte >> (7 - coluna % 8) & 1)
+
+    def linha(self, linha):
+        """Bytes (LIVRE/PAREDE) de uma linha, desempacotados dos bits."""
+        inicio = CABECALHO.size + linha * self.bytes_por_linha
+        dados = self._mmap[inicio:inicio + self.bytes_por_linha]
+        bits = format(int.from_bytes(dados, "big"), "b").zfill(self.bytes_por_linha * 8)
+        return bits.encode("ascii")[:self.colunas].translate(_TABELA_DE_BITS)
+
+    def para_grade(self):
+        grade = Grade(self.linhas, self.colunas)
+        for linha in range(self.linhas):
+            grade.definir_linha(linha, self.linha(linha))
+        return grade
+
+
+def salvar_labirinto(caminho, grade, inicio=None, fim=None):
+    """Salva em binário se o arquivo terminar em '.lab', senão em texto."""
+    if caminho.lower().endswith(".lab"):
+        grade.salvar_binario(caminho, inicio, fim)
+    else:
+        grade.salvar_texto(caminho, inicio, fim)
+
+
+def carregar_labirinto(caminho):
+    """Carrega texto ou binário (reconhecido pelo cabeçalho). Devolve (grade, S, E)."""
+    with open(caminho, "rb") as f:
+        binario = f.read(len(MAGICO)) == MAGICO
+    if binario:
+        return Grade.carregar_binario(caminho)
+    return Grade.carregar_texto(caminho)
+
+
+# --- Buscas ---
+
+class Busca:
+    """
+    Base comum das buscas de inicio até fim (posições (linha, coluna)). Cada
+    busca pode ser executada passo a passo com passo() (para animação) ou até
+    o fim com resolver(); expandidos e tempo medem o trabalho feito.
+    """
+
+    def __init__(self, grade, inicio, fim):
+        self.grade = grade
+        self.inicio = grade.indice(*inicio)
+        self.fim = grade.indice(*fim)
+        if grade.celulas[self.inicio] == PAREDE or grade.celulas[self.fim] == PAREDE:
+            raise ValueError("Início e fim não podem estar em paredes")
+        self.terminado = False
+        self.encontrado = False
+        self.expandidos = 0
+        self.tempo = 0.0
+
+    def passo(self):
+        """
+        Expande uma célula. Devolve (célula, novas células na fronteira) como
+        índices da grade, ou None se a busca já terminou sem achar o fim.
+        Quando o fim é alcançado, encontrado passa a True e a busca termina.
+        """
+        raise NotImplementedError
+
+    def resolver(self):
+        """Executa a busca até o fim e devolve o caminho (ver caminho())."""
+        inicio = time.perf_counter()
+        while self.passo() is not None and not self.terminado:
+            pass
+        self.tempo += time.perf_counter() - inicio
+        return self.caminho()
+
+    def caminho(self):
+        """Posições de inicio até fim, ou [] se o fim não foi alcançado."""
+        raise NotImplementedError
+
+    def _caminho_por_direcoes(self):
+        # Volta do fim até ORIGEM seguindo as direções gravadas em self.direcao
+        direcao = self.direcao
+        deslocamentos = self.grade.deslocamentos
+        atual = self.fim
+        indices = [atual]
+        while direcao[atual] != ORIGEM:
+            atual -= deslocamentos[direcao[atual] - 1]
+            indices.append(atual)
+        posicao = self.grade.posicao
+        return [posicao(i) for i in reversed(indices)]
+
+    def _heuristica(self, indice):
+        # Distância de Manhattan até o fim (a borda não altera a diferença)
+        linha, coluna = divmod(indice, self.grade.largura)
+        return abs(linha - self._fim_linha) + abs(coluna - self._fim_coluna)
+
+
+class BuscaLargura(Busca):
+    """
+    BFS. A fila é mantida por níveis (nível atual + próximo nível), o que dá a
+    mesma ordem de uma fila FIFO mas só guarda a fronteira em memória.
+    """
+
+    nome = "BFS"
+
+    def __init__(self, grade, inicio, fim):
+        super().__init__(grade, inicio, fim)
+        self.direcao = grade.celulas.translate(_TABELA_BUSCA)
+        self.direcao[self.inicio] = ORIGEM
+        self._nivel = [self.inicio]
+        self._pos = 0
+        self._proximo = []
+
+    def passo(self):
+        if self.terminado:
+            return None
+        if self._pos == len(self._nivel):
+            if not self._proximo:
+                self.terminado = True
+                return None
+            self._nivel, self._proximo, self._pos = self._proximo, [], 0
+
+        atual = self._nivel[self._pos]
+        self._pos += 1
+        self.expandidos += 1
+        if atual == self.fim:
+            self.terminado = self.encontrado = True
+            return atual, []
+
+        direcao = self.direcao
+        novos = []
+        for sentido, deslocamento in enumerate(self.grade.deslocamentos, 1):
+            vizinho = atual + deslocamento
+            if not direcao[vizinho]:
+                direcao[vizinho] = sentido
+                novos.append(vizinho)
+        self._proximo.extend(novos)
+        return atual, novos
+
+    def resolver(self, vetorizado=False):
+        """
+        Executa a busca até o fim (continuando de onde passo() parou) e devolve
+        o caminho como lista de posições, ou [] se não houver caminho.
+        Com vetorizado=True usa NumPy, bem mais rápido em grades enormes.
+        """
+        inicio = time.perf_counter()
+        if not self.terminado:
+            if vetorizado:
+                self._resolver_numpy()
+            else:
+                self._resolver_python()
+            self.terminado = True
+            self.encontrado = self.direcao[self.fim] != 0
+            self._nivel, self._pos, self._proximo = [], 0, []
+        self.tempo += time.perf_counter() - inicio
+        return self.caminho()
+
+    def _resolver_python(self):
+        # Termina o nível em que o fim é alcançado em vez de esperar ele sair
+        # da fila; o predecessor já está gravado desde a descoberta.
+        direcao = self.direcao
+        fim = self.fim
+        cima, baixo, esquerda, direita = self.grade.deslocamentos
+        nivel = self._nivel[self._pos:]
+        proximo = self._proximo
+        if not nivel:
+            nivel, proximo = proximo, []
+        while nivel and not direcao[fim]:
+            self.expandidos += len(nivel)
+            adicionar = proximo.append
+            for atual in nivel:
+                vizinho = atual + cima
+                if not direcao[vizinho]:
+                    direcao[vizinho] = 1
+                    adicionar(vizinho)
+                vizinho = atual + baixo
+                if not direcao[vizinho]:
+                    direcao[vizinho] = 2
+                    adicionar(vizinho)
+                vizinho = atual + esquerda
+                if not direcao[vizinho]:
+                    direcao[vizinho] = 3
+                    adicionar(vizinho)
+                vizinho = atual + direita
+                if not direcao[vizinho]:
+                    direcao[vizinho] = 4
+                    adicionar(vizinho)
+            nivel, proximo = proximo, []
+
+    def _resolver_numpy(self):
+        import numpy as np
+
+        # Visão sem cópia do bytearray: as marcações continuam valendo para
+        # caminho() e passo().
+        direcao = np.frombuffer(self.direcao, dtype=np.uint8)
+        fim = self.fim
+        fronteira = np.array(self._nivel[self._pos:], dtype=np.int64)
+        proximo = np.array(self._proximo, dtype=np.int64)
+        if not fronteira.size:
+            fronteira, proximo = proximo, fronteira
+        while fronteira.size and not direcao[fim]:
+            self.expandidos += int(fronteira.size)
+            novos = [proximo]
+            for sentido, deslocamento in enumerate(self.grade.deslocamentos, 1):
+                vizinhos = fronteira + deslocamento
+                vizinhos = vizinhos[direcao[vizinhos] == 0]
+                direcao[vizinhos] = sentido
+                novos.append(vizinhos)
+            fronteira = np.concatenate(novos)
+            proximo = fronteira[:0]
+
+    def caminho(self):
+        if not self.direcao[self.fim]:
+            return []
+        return self._caminho_por_direcoes()
+
+
+class BuscaAEstrela(Busca):
+    """
+    A* com heurística de Manhattan (admissível e consistente na grade de 4
+    vizinhos, então cada célula é fechada uma vez só). Empates em f são
+    desfeitos a favor do maior g, o que em áreas abertas segue direto para
+    o fim em vez de abrir uma faixa inteira de células equivalentes.
+    """
+
+    nome = "A*"
+
+    def __init__(self, grade, inicio, fim):
+        super().__init__(grade, inicio, fim)
+        self._fim_linha, self._fim_coluna = divmod(self.fim, grade.largura)
+        self.direcao = grade.celulas.translate(_TABELA_BUSCA)
+        self.direcao[self.inicio] = ORIGEM
+        # g de cada célula, indexado como a grade (4 bytes por célula)
+        self._g = array('i', [SEM_CUSTO]) * len(grade.celulas)
+        self._g[self.inicio] = 0
+        self._heap = [(self._heuristica(self.inicio), 0, self.inicio)]
+
+    def passo(self):
+        if self.terminado:
+            return None
+        heap = self._heap
+        g_atual = self._g
+        while heap:
+            _, menos_g, atual = heappop(heap)
+            if -menos_g == g_atual[atual]:
+                break
+        else:
+            self.terminado = True
+            return None
+
+        self.expandidos += 1
+        if atual == self.fim:
+            self.terminado = self.encontrado = True
+            return atual, []
+
+        direcao = self.direcao
+        g = g_atual[atual] + 1
+        novos = []
+        for sentido, deslocamento in enumerate(self.grade.deslocamentos, 1):
+            vizinho = atual + deslocamento
+            if direcao[vizinho] == BLOQUEADA or g >= g_atual[vizinho]:
+                continue
+            g_atual[vizinho] = g
+            direcao[vizinho] = sentido
+            heappush(heap, (g + self._heuristica(vizinho), -g, vizinho))
+            novos.append(vizinho)
+        return atual, novos
+
+    def caminho(self):
+        if not self.encontrado:
+            return []
+        return self._caminho_por_direcoes()
+
+
+class BuscaBidirecional(Busca):
+    """
+    BFS simultâneo a partir do início e do fim, um nível inteiro de cada vez,
+    sempre pelo lado com a fronteira menor. Os dois lados marcam o mesmo
+    bytearray de direções (1..4 e ORIGEM para o início, 6..9 e DESTINO para
+    o fim); a busca para quando um lado encosta em uma célula do outro. Como
+    os níveis são expandidos inteiros, o primeiro encontro já dá um caminho
+    mínimo.
+    """
+
+    nome = "BFS bidirecional"
+
+    def __init__(self, grade, inicio, fim):
+        super().__init__(grade, inicio, fim)
+        self.direcao = grade.celulas.translate(_TABELA_BUSCA)
+        self.direcao[self.fim] = DESTINO
+        self.direcao[self.inicio] = ORIGEM
+        # Por lado: [nível atual, posição no nível, próximo nível]
+        self._lados = ([[self.inicio], 0, []], [[self.fim], 0, []])
+        self._lado = 0
+        self._encontro = None
+
+    def passo(self):
+        if self.terminado:
+            return None
+        if self.inicio == self.fim:
+            self.expandidos += 1
+            self.terminado = self.encontrado = True
+            return self.inicio, []
+
+        estado = self._lados[self._lado]
+        if estado[1] == len(estado[0]):
+            estado[0], estado[1], estado[2] = estado[2], 0, []
+            outro = self._lados[1 - self._lado]
+            if not estado[0] or not outro[0]:
+                # Um dos lados esgotou sua região sem encontrar o outro
+                self.terminado = True
+                return None
+            if len(outro[0]) < len(estado[0]):
+                self._lado = 1 - self._lado
+                estado = outro
+
+        lado = self._lado
+        atual = estado[0][estado[1]]
+        estado[1] += 1
+        self.expandidos += 1
+
+        direcao = self.direcao
+        base = 0 if lado == 0 else 5
+        novos = []
+        for sentido, deslocamento in enumerate(self.grade.deslocamentos, 1):
+            vizinho = atual + deslocamento
+            marca = direcao[vizinho]
+            if not marca:
+                direcao[vizinho] = sentido + base
+                novos.append(vizinho)
+            elif marca != BLOQUEADA and (marca > 5) != (lado == 1):
+                self._encontro = (atual, vizinho) if lado == 0 else (vizinho, atual)
+                self.terminado = self.encontrado = True
+                break
+        estado[2].extend(novos)
+        return atual, novos
+
+    def resolver(self):
+        """
+        Executa a busca até o fim (continuando de onde passo() parou) um
+        nível inteiro por vez, como BuscaLargura._resolver_python, e devolve
+        o caminho. Expande as mesmas células, na mesma ordem, que passo().
+        """
+        inicio = time.perf_counter()
+        if not self.terminado:
+            if self.inicio == self.fim:
+                self.passo()
+            else:
+                self._resolver_python()
+        self.tempo += time.perf_counter() - inicio
+        return self.caminho()
+
+    def _resolver_python(self):
+        direcao = self.direcao
+        cima, baixo, esquerda, direita = self.grade.deslocamentos
+        lados = self._lados
+        lado = self._lado
+        while True:
+            estado = lados[lado]
+            if estado[1] == len(estado[0]):
+                estado[0], estado[1], estado[2] = estado[2], 0, []
+                outro = lados[1 - lado]
+                if not estado[0] or not outro[0]:
+                    self.terminado = True
+                    break
+                if len(outro[0]) < len(estado[0]):
+                    lado = 1 - lado
+                    estado = outro
+
+            # Marcas deste lado e faixa de marcas do outro lado
+            base = 0 if lado == 0 else 5
+            s_cima, s_baixo, s_esquerda, s_direita = base + 1, base + 2, base + 3, base + 4
+            outro_min, outro_max = (6, DESTINO) if lado == 0 else (1, ORIGEM)
+            nivel, inicio_nivel, proximo = estado
+            adicionar = proximo.append
+            encontro = None
+            for i in range(inicio_nivel, len(nivel)):
+                atual = nivel[i]
+                vizinho = atual + cima
+                marca = direcao[vizinho]
+                if not marca:
+                    direcao[vizinho] = s_cima
+                    adicionar(vizinho)
+                elif outro_min <= marca <= outro_max:
+                    encontro = (atual, vizinho)
+                    break
+                vizinho = atual + baixo
+                marca = direcao[vizinho]
+                if not marca:
+                    direcao[vizinho] = s_baixo
+                    adicionar(vizinho)
+                elif outro_min <= marca <= outro_max:
+                    encontro = (atual, vizinho)
+                    break
+                vizinho = atual + esquerda
+                marca = direcao[vizinho]
+                if not marca:
+                    direcao[vizinho] = s_esquerda
+                    adicionar(vizinho)
+                elif outro_min <= marca <= outro_max:
+                    encontro = (atual, vizinho)
+                    break
+                vizinho = atual + direita
+                marca = direcao[vizinho]
+                if not marca:
+                    direcao[vizinho] = s_direita
+                    adicionar(vizinho)
+                elif outro_min <= marca <= outro_max:
+                    encontro = (atual, vizinho)
+                    break
+
+            if encontro is not None:
+                self.expandidos += i - inicio_nivel + 1
+                estado[1] = i + 1
+                self._encontro = encontro if lado == 0 else encontro[::-1]
+                self.terminado = self.encontrado = True
+                break
+            self.expandidos += len(nivel) - inicio_nivel
+            estado[1] = len(nivel)
+        self._lado = lado
+
+    def caminho(self):
+        if not self.encontrado:
+            return []
+        posicao = self.grade.posicao
+        if self.inicio == self.fim:
+            return [posicao(self.inicio)]
+        direcao = self.direcao
+        deslocamentos = self.grade.deslocamentos
+        atual, outro = self._encontro
+        ida = [atual]
+        while direcao[atual] != ORIGEM:
+            atual -= deslocamentos[direcao[atual] - 1]
+            ida.append(atual)
+        volta = [outro]
+        while direcao[outro] != DESTINO:
+            outro -= deslocamentos[direcao[outro] - 6]
+            volta.append(outro)
+        return [posicao(i) for i in ida[::-1] + volta]
+
+
+class BuscaJPS(Busca):
+    """
+    Jump Point Search adaptada à grade de 4 vizinhos. Entre caminhos mínimos
+    equivalentes só se considera o que vira para a horizontal o mais cedo
+    possível: andando na vertical, só se vira para um lado quando a célula
+    lateral acabou de se abrir (estava bloqueada na célula anterior); andando
+    na horizontal qualquer virada vale, então cada célula de um salto
+    horizontal testa os saltos verticais. Só os pontos de salto entram no
+    heap do A*; examinadas conta as células percorridas pelos saltos.
+    """
+
+    nome = "JPS"
+
+    def __init__(self, grade, inicio, fim):
+        super().__init__(grade, inicio, fim)
+        self._fim_linha, self._fim_coluna = divmod(self.fim, grade.largura)
+        self.examinadas = 0
+        self._g = {self.inicio: 0}
+        self._pai = {self.inicio: None}
+        self._heap = [(self._heuristica(self.inicio), 0, self.inicio)]
+
+    def _saltar_vertical(self, atual, deslocamento):
+        celulas = self.grade.celulas
+        fim = self.fim
+        while True:
+            anterior = atual
+            atual += deslocamento
+            self.examinadas += 1
+            if celulas[atual]:
+                return None
+            if atual == fim:
+                return atual
+            # Vizinho forçado: um lado abre aqui mas estava fechado antes
+            if (not celulas[atual - 1] and celulas[anterior - 1]) or \
+                    (not celulas[atual + 1] and celulas[anterior + 1]):
+                return atual
+
+    def _saltar_horizontal(self, atual, deslocamento):
+        celulas = self.grade.celulas
+        fim = self.fim
+        largura = self.grade.largura
+        while True:
+            atual += deslocamento
+            self.examinadas += 1
+            if celulas[atual]:
+                return None
+            if atual == fim:
+                return atual
+            if self._saltar_vertical(atual, -largura) is not None or \
+                    self._saltar_vertical(atual, largura) is not None:
+                return atual
+
+    def passo(self):
+        if self.terminado:
+            return None
+        heap = self._heap
+        g_atual = self._g
+        while heap:
+            _, menos_g, atual = heappop(heap)
+            if -menos_g == g_atual[atual]:
+                break
+        else:
+            self.terminado = True
+            return None
+
+        self.expandidos += 1
+        if atual == self.fim:
+            self.terminado = self.encontrado = True
+            return atual, []
+
+        celulas = self.grade.celulas
+        largura = self.grade.largura
+        pai = self._pai[atual]
+        if pai is None:
+            sentidos = (-largura, largura, -1, 1)
+        elif atual // largura == pai // largura:
+            frente = 1 if atual > pai else -1
+            sentidos = (frente, -largura, largura)
+        else:
+            frente = largura if atual > pai else -largura
+            sentidos = (frente,) + tuple(
+                lado for lado in (-1, 1)
+                if not celulas[atual + lado] and celulas[atual - frente + lado]
+            )
+
+        novos = []
+        for sentido in sentidos:
+            if sentido in (-1, 1):
+                ponto = self._saltar_horizontal(atual, sentido)
+                distancia = abs(ponto - atual) if ponto is not None else 0
+            else:
+                ponto = self._saltar_vertical(atual, sentido)
+                distancia = abs(ponto - atual) // largura if ponto is not None else 0
+            if ponto is None:
+                continue
+            g = g_atual[atual] + distancia
+            if g >= g_atual.get(ponto, g + 1):
+                continue
+            g_atual[ponto] = g
+            self._pai[ponto] = atual
+            heappush(heap, (g + self._heuristica(ponto), -g, ponto))
+            novos.append(ponto)
+        return atual, novos
+
+    def caminho(self):
+        if not self.encontrado:
+            return []
+        largura = self.grade.largura
+        pontos = [self.fim]
+        while self._pai[pontos[-1]] is not None:
+            pontos.append(self._pai[pontos[-1]])
+        pontos.reverse()
+        # Preenche as retas entre pontos de salto consecutivos
+        indices = [pontos[0]]
+        for origem, destino in zip(pontos, pontos[1:]):
+            if origem // largura == destino // largura:
+                passo = 1 if destino > origem else -1
+            else:
+                passo = largura if destino > origem else -largura
+            indices.extend(range(origem + passo, destino + passo, passo))
+        posicao = self.grade.posicao
+        return [posicao(i) for i in indices]
+
+
+ALGORITMOS = {
+    busca.nome: busca for busca in (BuscaLargura, BuscaAEstrela, BuscaBidirecional, BuscaJPS)
+}
+
+
+def comparar(grade, inicio, fim, algoritmos=None):
+    """
+    Resolve o mesmo labirinto com cada algoritmo. Devolve {nome: (busca,
+    caminho)}; busca.expandidos e busca.tempo medem o trabalho de cada um.
+    """
+    resultados = {}
+    for nome in algoritmos or ALGORITMOS:
+        busca = ALGORITMOS[nome](grade, inicio, fim)
+        resultados[nome] = (busca, busca.resolver())
+    return resultados
+
+
+if __name__ == "__main__":
+    # Uso: python solucionador.py [linhas] [colunas] [densidade de paredes]
+    #   ou python solucionador.py arquivo (.txt ou .lab, com S e E)
+    inicio_t = time.perf_counter()
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        grade, inicio, fim = carregar_labirinto(sys.argv[1])
+        if not inicio or not fim:
+            sys.exit("O labirinto deve ter um ponto de Início (S) e um de Fim (E)")
+        linhas, colunas = grade.linhas, grade.colunas
+        print(f"Grade {linhas}x{colunas} carregada em {time.perf_counter() - inicio_t:.2f}s")
+    else:
+        linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+        colunas = int(sys.argv[2]) if len(sys.argv) > 2 else linhas
+        densidade = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+        grade = Grade.aleatoria(linhas, colunas, densidade, semente=0)
+        # Abre os cantos de S e E para eles não nascerem cercados
+        for linha, coluna in ((0, 0), (0, 1), (1, 0), (linhas - 1, colunas - 1),
+                              (linhas - 1, colunas - 2), (linhas - 2, colunas - 1)):
+            grade.definir(linha, coluna, False)
+        inicio, fim = (0, 0), (linhas - 1, colunas - 1)
+        print(f"Grade {linhas}x{colunas} gerada em {time.perf_counter() - inicio_t:.2f}s")
+
+    try:
+        import numpy  # noqa: F401
+        vetorizado = True
+    except ImportError:
+        vetorizado = False
+
+    referencia = BuscaLargura(grade, inicio, fim)
+    caminho = referencia.resolver(vetorizado=vetorizado)
+    modo = "NumPy" if vetorizado else "Python puro"
+    print(f"{'BFS (' + modo + ')':22} {referencia.expandidos:>12} expandidas {referencia.tempo:8.2f}s  "
+          f"caminho: {len(caminho) or '-'}")
+
+    # Os demais algoritmos devem achar caminhos do mesmo tamanho que o BFS
+    outros = [nome for nome in ALGORITMOS if nome != BuscaLargura.nome]
+    for nome, (busca, caminho_busca) in comparar(grade, inicio, fim, outros).items():
+        situacao = "ok" if len(caminho_busca) == len(caminho) else "DIFERENTE DO BFS"
+        print(f"{nome:22} {busca.expandidos:>12} expandidas {busca.tempo:8.2f}s  "
+              f"caminho: {len(caminho_busca) or '-'} ({situacao})")
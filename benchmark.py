@@ -0,0 +1,277 @@
+"""
+Benchmark das árvores das atividades (BinaryTree, ArrayBinaryTree, travessias
+da atividade 3, AVLTree e BPlusTree).
+
+Para cada estrutura, carga (random, sorted, reversed, zipfian, adversarial) e
+tamanho, mede inserção, busca, remoção e consulta por intervalo: operações por
+segundo, percentis de latência, pico de memória da construção e altura final.
+O resultado sai em JSON para comparar versões.
+
+Exemplo:
+    python benchmark.py --sizes 1000 10000 --output resultado.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WORKLOADS = ("random", "sorted", "reversed", "zipfian", "adversarial")
+STRUCTURES = ("BinaryTree", "ArrayBinaryTree", "AVLTree", "BPlusTree", "traversals")
+
+
+@lru_cache(maxsize=None)
+def load_module(folder, filename):
+    """Importa um arquivo de atividade (as pastas têm espaços no nome)."""
+    path = os.path.join(ROOT, folder, filename)
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        name = os.path.splitext(filename)[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        sys.path.pop(0)
+
+
+# ------------------------------
+# Cargas de trabalho
+
+def zipf_sampler(n, rng, s=1.1):
+    """Sorteia posições 0..n-1 com probabilidade proporcional a 1/(k+1)^s."""
+    cumulative = list(accumulate(1 / (k + 1) ** s for k in range(n)))
+    total = cumulative[-1]
+
+    def sample():
+        return min(bisect_left(cumulative, rng.random() * total), n - 1)
+    return sample
+
+
+def make_workload(kind, n, num_ops, rng):
+    """
+    Devolve (chaves na ordem de inserção, chaves buscadas, chaves removidas).
+    As chaves são inteiros distintos 0..n-1 (a AVL não aceita duplicatas); no
+    máximo metade delas é removida, para a altura final ainda dizer algo.
+    """
+    keys = list(range(n))
+    if kind == "random":
+        rng.shuffle(keys)
+    elif kind == "reversed":
+        keys.reverse()
+    elif kind == "adversarial":
+        # Zigue-zague (menor, maior, segundo menor, ...): árvore sem
+        # balanceamento vira uma lista com altura n - 1.
+        keys = [keys[i // 2] if i % 2 == 0 else keys[n - 1 - i // 2] for i in range(n)]
+    elif kind == "zipfian":
+        rng.shuffle(keys)
+        sample = zipf_sampler(n, rng)
+        searches = [keys[sample()] for _ in range(num_ops)]
+        removals = list(dict.fromkeys(keys[sample()] for _ in range(num_ops)))[: n // 2]
+        return keys, searches, removals
+    elif kind != "sorted":
+        raise ValueError(f"Carga desconhecida: {kind}")
+
+    searches = [rng.randrange(n) for _ in range(num_ops)]
+    removals = rng.sample(range(n), min(num_ops, n // 2))
+    return keys, searches, removals
+
+
+# ------------------------------
+# Adaptadores: uma interface comum sobre cada estrutura
+
+def make_structures():
+    atividade_2 = load_module("Atividade 2 - AVA", "atividade_2.py")
+    atividade_5 = load_module("Atividade 5 - AVA", "atividade_5.py")
+    arvore_b = load_module("Atividade 5 - AVA", "arvore_b.py")
+
+    return {
+        "BinaryTree": {
+            "new": atividade_2.BinaryTree,
+            "insert": lambda t, k: t.insert(k),
+            "search": lambda t, k: t.search(k),
+            "delete": lambda t, k: t.remove(k),
+            "range": None,
+            "height": lambda t: t.height() + 1,
+            "balanced": False,
+        },
+        "ArrayBinaryTree": {
+            "new": atividade_2.ArrayBinaryTree,
+            "insert": lambda t, k: t.insert(k),
+            "search": lambda t, k: t.search(k),
+            "delete": lambda t, k: t.remove(k),
+            "range": None,
+            "height": lambda t: t.height() + 1,
+            "balanced": False,
+        },
+        "AVLTree": {
+            "new": atividade_5.AVLTree,
+            "insert": lambda t, k: t.insert(k),
+            "search": lambda t, k: t.get_node_depth(k),
+            "delete": lambda t, k: t.delete(k),
+            "range": lambda t, a, b: t.find_nodes_in_range(a, b),
+            "height": lambda t: t.get_height(t.root),
+            "balanced": True,
+        },
+        "BPlusTree": {
+            "new": arvore_b.BPlusTree,
+            "insert": lambda t, k: t.insert(k),
+            "search": lambda t, k: t.get_node_depth(k),
+            "delete": lambda t, k: t.delete(k),
+            "range": lambda t, a, b: t.find_nodes_in_range(a, b),
+            "height": lambda t: t.height(),
+            "balanced": True,
+        },
+    }
+
+
+# ------------------------------
+# Medição
+
+def summarize(latencies_ns, elapsed):
+    latencies_ns.sort()
+    count = len(latencies_ns)
+
+    def pct(p):
+        return latencies_ns[min(count - 1, int(p / 100 * count))] / 1000 if count else None
+
+    return {
+        "ops": count,
+        "seconds": elapsed,
+        "ops_per_second": count / elapsed if elapsed else None,
+        "latency_us": {"p50": pct(50), "p90": pct(90), "p99": pct(99), "max": pct(100)},
+    }
+
+
+def timed(op, tree, args_list):
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    start = time.perf_counter()
+    for args in args_list:
+        t0 = clock()
+        op(tree, *args)
+        append(clock() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def peak_build_memory(structure, keys):
+    tracemalloc.start()
+    tree = structure["new"]()
+    insert = structure["insert"]
+    for key in keys:
+        insert(tree, key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_structure(structure, kind, n, num_ops, seed, range_width):
+    rng = random.Random(f"{seed}-{kind}-{n}")
+    keys, searches, removals = make_workload(kind, n, num_ops, rng)
+    result = {"peak_build_memory_bytes": peak_build_memory(structure, keys)}
+
+    tree = structure["new"]()
+    result["insert"] = timed(structure["insert"], tree, [(k,) for k in keys])
+    result["height_after_insert"] = structure["height"](tree)
+    result["search"] = timed(structure["search"], tree, [(k,) for k in searches])
+    if structure["range"] is not None:
+        starts = [rng.randrange(n) for _ in range(max(1, num_ops // 10))]
+        result["range"] = timed(structure["range"], tree, [(a, a + range_width) for a in starts])
+    result["delete"] = timed(structure["delete"], tree, [(k,) for k in removals])
+    result["final_height"] = structure["height"](tree)
+    return result
+
+
+def node_levels(root):
+    """Número de níveis de uma árvore de nós com left/right."""
+    levels = 0
+    level = [root] if root else []
+    while level:
+        levels += 1
+        level = [child for node in level for child in (node.left, node.right) if child]
+    return levels
+
+
+def bench_traversals(kind, n, seed):
+    atividade_3 = load_module("Atividade 3 - AVA", "atividade_3.py")
+    keys, _, _ = make_workload(kind, n, 0, random.Random(f"{seed}-{kind}-{n}"))
+    tree = atividade_3.BinaryTree()
+    for key in keys:
+        tree.insert(key)
+
+    result = {"final_height": node_levels(tree.root)}
+    for name in ("inorder", "preorder", "postorder", "levelorder", "iter_morris_inorder"):
+        method = getattr(tree, name)
+        start = time.perf_counter()
+        count = sum(1 for _ in method())
+        elapsed = time.perf_counter() - start
+        result[name] = {"items": count, "seconds": elapsed,
+                        "items_per_second": count / elapsed if elapsed else None}
+    start = time.perf_counter()
+    for _, _ in zip(range(100), tree.iter_inorder()):
+        pass
+    result["first_100_inorder_seconds"] = time.perf_counter() - start
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--structures", nargs="+", choices=STRUCTURES, default=list(STRUCTURES))
+    parser.add_argument("--ops", type=int, default=10000, help="buscas/remoções por execução")
+    parser.add_argument("--range-width", type=int, default=100)
+    parser.add_argument("--unbalanced-limit", type=int, default=20000,
+                        help="tamanho máximo para árvores sem balanceamento em cargas ordenadas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="arquivo JSON (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    structures = make_structures()
+    results = []
+    for name in args.structures:
+        for kind in args.workloads:
+            for n in args.sizes:
+                entry = {"structure": name, "workload": kind, "size": n}
+                degenerate = kind in ("sorted", "reversed", "adversarial")
+                unbalanced = name == "traversals" or not structures[name]["balanced"]
+                if unbalanced and degenerate and n > args.unbalanced_limit:
+                    entry["skipped"] = "altura O(n): custo quadrático acima de --unbalanced-limit"
+                elif name == "traversals":
+                    entry.update(bench_traversals(kind, n, args.seed))
+                else:
+                    entry.update(bench_structure(structures[name], kind, n, args.ops,
+                                                 args.seed, args.range_width))
+                results.append(entry)
+                print(f"{name:16} {kind:12} {n:>9}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "ops": args.ops,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()